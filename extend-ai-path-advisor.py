@@ -8,8 +8,10 @@ Extends AI Path Advisor with:
 
 import os
 import json
-import re
 import shutil
+import stat
+import tempfile
+from contextlib import ExitStack, suppress
 
 root = "/workspace/ai-path-advisor-starter"
 backend = os.path.join(root, "backend")
@@ -158,12 +160,37 @@ for new_resource in new_resources:
 
 # Save updated JSONs
 print("Saving updated data files...")
-with open(os.path.join(data_dir, "skills.json"), "w") as f:
-    json.dump(skills, f, indent=2)
-with open(os.path.join(data_dir, "modules.json"), "w") as f:
-    json.dump(modules, f, indent=2)
-with open(os.path.join(data_dir, "resources.json"), "w") as f:
-    json.dump(resources, f, indent=2)
+# Stage all three files under one ExitStack, make them durable with a single
+# os.sync(), then swap them in back-to-back; a failure before the swap leaves
+# every original untouched and no temp files behind.
+outputs = [("skills.json", skills), ("modules.json", modules), ("resources.json", resources)]
+staged = []
+try:
+    with ExitStack() as stack:
+        for filename, payload in outputs:
+            final_path = os.path.join(data_dir, filename)
+            tmp = stack.enter_context(
+                tempfile.NamedTemporaryFile("w", dir=data_dir, suffix=".tmp", delete=False)
+            )
+            staged.append((tmp.name, final_path))
+            json.dump(payload, tmp, indent=2)
+            # Temp files are created 0600; keep the mode the data file had
+            try:
+                mode = stat.S_IMODE(os.stat(final_path).st_mode)
+            except FileNotFoundError:
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+            os.fchmod(tmp.fileno(), mode)
+    # Closing the stack flushed all three files; one barrier covers them
+    os.sync()
+    for tmp_name, final_path in staged:
+        os.replace(tmp_name, final_path)
+except BaseException:
+    for tmp_name, _ in staged:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+    raise
 
 # ---------- Update FastAPI main.py ----------
 print("Updating FastAPI backend...")
@@ -205,13 +232,12 @@ if '"public_health"' not in main_py:
     ]
 }'''
     
-    # Replace MAJOR_TARGETS
-    main_py = re.sub(
-        r'MAJOR_TARGETS = \{[^}]+\}',
-        major_targets_new,
-        main_py,
-        flags=re.DOTALL
-    )
+    # Replace MAJOR_TARGETS up to its closing brace
+    start = main_py.find("MAJOR_TARGETS = {")
+    if start != -1:
+        end = main_py.find("}", start + len("MAJOR_TARGETS = {")) + 1
+        if end:
+            main_py = main_py[:start] + major_targets_new + main_py[end:]
 
 # Add quiz system if not present
 if "QUIZ_BANK" not in main_py:
@@ -432,10 +458,7 @@ if "startQuiz" not in page_tsx:
   const [quizResult, setQuizResult] = useState<any>(null)
   const [showQuiz, setShowQuiz] = useState(false)"""
     
-    page_tsx = page_tsx.replace(
-        "  const [error, setError] = useState<string | null>(null)",
-        state_insert
-    )
+    error_line = "  const [error, setError] = useState<string | null>(null)"
     
     # Add quiz functions before generateRoadmap
     quiz_functions = """
@@ -482,11 +505,18 @@ if "startQuiz" not in page_tsx:
   }
 """
     
-    # Insert functions before generateRoadmap
-    page_tsx = page_tsx.replace(
-        "  const generateRoadmap = async () => {",
-        quiz_functions + "\n  const generateRoadmap = async () => {"
-    )
+    # Splice state and functions in one pass: locate both anchors, then
+    # build the new source with a single join instead of two full replaces
+    i1 = page_tsx.find(error_line)
+    i2 = page_tsx.find("  const generateRoadmap = async () => {")
+    if i1 != -1 and i2 > i1:
+        page_tsx = "".join([
+            page_tsx[:i1],
+            state_insert,
+            page_tsx[i1 + len(error_line):i2],
+            quiz_functions + "\n",
+            page_tsx[i2:],
+        ])
     
     # Add quiz UI in the form section
     quiz_ui = """
@@ -576,11 +606,10 @@ if "startQuiz" not in page_tsx:
                 </div>
 """
     
-    # Insert quiz UI before the generate button
-    page_tsx = page_tsx.replace(
-        '                <div className="md:col-span-2">',
-        quiz_ui + '\n                <div className="md:col-span-2">'
-    )
+    # Insert quiz UI once, ahead of the baseline skills field it fills in
+    idx = page_tsx.find('                <div className="md:col-span-2">')
+    if idx != -1:
+        page_tsx = "".join([page_tsx[:idx], quiz_ui, "\n", page_tsx[idx:]])
 
 # Update major options to include new majors
 if '"public_health"' not in page_tsx:
@@ -591,12 +620,13 @@ if '"public_health"' not in page_tsx:
                     <option value="public_health">Public Health</option>
                     <option value="materials">Materials Science</option>'''
     
-    page_tsx = re.sub(
-        r'<option value="cs">.*?</option>\s*<option value="ee">.*?</option>\s*<option value="physics">.*?</option>\s*<option value="data-science">.*?</option>',
-        major_options,
-        page_tsx,
-        flags=re.DOTALL
-    )
+    # The four existing options are one contiguous block, so splice it out
+    # by position rather than running a backtracking DOTALL regex
+    start = page_tsx.find('<option value="cs">')
+    last = page_tsx.find('<option value="data-science">', start)
+    if start != -1 and last != -1:
+        end = page_tsx.find('</option>', last) + len('</option>')
+        page_tsx = page_tsx[:start] + major_options + page_tsx[end:]
 
 # Save updated page.tsx
 with open(page_path, "w") as f:
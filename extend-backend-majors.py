@@ -4,177 +4,268 @@ Extend the AI Path Advisor backend with all 25+ majors
 """
 
 import os
+import sys
 import json
+import hashlib
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder/decoder
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # orjson/json handle decode and encode instead
+    msgspec = None
+
+
+# Slotted records for the backend data files; no per-instance __dict__, and
+# both msgspec and orjson serialize them without an asdict() pass
+@dataclass(slots=True)
+class Skill:
+    skill_id: str
+    name: str
+    prereq_ids: list[str]
+    tags: list[str]
+    difficulty: int
+
+
+@dataclass(slots=True)
+class Module:
+    module_id: str
+    skill_ids: list[str]
+    outcomes: list[str]
+    assessments: list[str]
+    project_ideas: list[str]
+    target_hours: int
+
+
+@dataclass(slots=True)
+class Resource:
+    resource_id: str
+    type: str
+    title: str
+    provider: str
+    skills: list[str]
+    level: str
+    time_est_hours: int
+    quality_score: float
+    cost: str
+    format: list[str]
+
+
+def load_json(path):
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with path.open('r') as f:
+        return json.load(f)
+
+
+def dump_json(path, obj):
+    # Keys follow the dataclass field order on every encoder, so the output
+    # does not depend on which library is installed
+    if msgspec is not None:
+        path.write_bytes(msgspec.json.format(msgspec.json.encode(obj), indent=2))
+        return
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with path.open('w') as f:
+        json.dump([asdict(record) for record in obj], f, indent=2)
 
 # Path to backend data
 backend_dir = "ai-path-advisor-starter/backend"
 data_dir = os.path.join(backend_dir, "data")
+SKILLS_PATH, MODULES_PATH, RESOURCES_PATH = (
+    Path(data_dir) / name for name in ("skills.json", "modules.json", "resources.json")
+)
 
 # Ensure directories exist
 os.makedirs(data_dir, exist_ok=True)
 
-# Load existing data or create new
-def load_or_create(filename, default):
-    filepath = os.path.join(data_dir, filename)
-    if os.path.exists(filepath):
-        with open(filepath, 'r') as f:
-            return json.load(f)
-    return default
-
-skills = load_or_create("skills.json", [])
-modules = load_or_create("modules.json", [])
-resources = load_or_create("resources.json", [])
-
-# Track existing skills
-existing_skills = {s["skill_id"] for s in skills}
-
-def add_skill(sid, name, prereqs, tags, difficulty):
-    if sid not in existing_skills:
-        skills.append({
-            "skill_id": sid,
-            "name": name,
-            "prereq_ids": prereqs,
-            "tags": tags,
-            "difficulty": difficulty
-        })
-        existing_skills.add(sid)
+# Load existing data or create new, keyed by id so lookups and dedup are O(1)
+def load_or_create(path, schema, id_key):
+    if not path.exists():
+        return {}
+    if msgspec is not None:
+        records = msgspec.json.decode(path.read_bytes(), type=list[schema])
+    else:
+        records = [schema(**item) for item in load_json(path)]
+    return {getattr(record, id_key): record for record in records}
+
+skills = load_or_create(SKILLS_PATH, Skill, "skill_id")
+modules = load_or_create(MODULES_PATH, Module, "module_id")
+resources = load_or_create(RESOURCES_PATH, Resource, "resource_id")
+
+# Re-runs are idempotent: if neither this script nor the ids on disk have
+# changed since the last successful run, there is nothing left to merge
+STATE_PATH = Path(data_dir) / ".extend_state"
+
+def extend_state():
+    digest = hashlib.blake2b(Path(__file__).read_bytes())
+    for collection in (skills, modules, resources):
+        digest.update("\n".join(sorted(collection)).encode())
+    return digest.hexdigest()
+
+if STATE_PATH.exists() and STATE_PATH.read_text() == extend_state():
+    print("✅ Backend data already extended - nothing to do")
+    sys.exit(0)
+
+# Track which collections change so unchanged files are not rewritten
+dirty = {"skills": False, "modules": False, "resources": False}
+
+# Shared tag lists: every skill in a category references the same list
+TAG_MATH = ["math"]
+TAG_CHEMISTRY = ["chemistry"]
+TAG_BIOLOGY = ["biology"]
+TAG_MEDICINE = ["medicine"]
+TAG_NURSING = ["nursing"]
+TAG_MECH = ["mech"]
+TAG_CIVIL = ["civil"]
+TAG_CHEMENG = ["chemeng"]
+TAG_ENVIRONMENT = ["environment"]
+TAG_LAW = ["law"]
+TAG_ECONOMICS = ["economics"]
+TAG_EDUCATION = ["education"]
+TAG_ARCHITECTURE = ["architecture"]
+TAG_COMMUNICATIONS = ["communications"]
 
 # Add common prerequisites
-add_skill("math.algebra", "Algebra", [], ["math"], 1)
-add_skill("math.calculus_1", "Calculus I", ["math.algebra"], ["math"], 2)
-add_skill("math.calculus_2", "Calculus II", ["math.calculus_1"], ["math"], 3)
-add_skill("math.calculus_3", "Calculus III", ["math.calculus_2"], ["math"], 3)
-add_skill("math.linear_algebra", "Linear Algebra", ["math.algebra"], ["math"], 2)
-add_skill("math.discrete", "Discrete Mathematics", ["math.algebra"], ["math"], 2)
-add_skill("math.stats", "Statistics", ["math.algebra"], ["math"], 2)
+math_skills = {
+    "math.algebra": {"name": "Algebra", "prereq_ids": [], "tags": TAG_MATH, "difficulty": 1},
+    "math.calculus_1": {"name": "Calculus I", "prereq_ids": ["math.algebra"], "tags": TAG_MATH, "difficulty": 2},
+    "math.calculus_2": {"name": "Calculus II", "prereq_ids": ["math.calculus_1"], "tags": TAG_MATH, "difficulty": 3},
+    "math.calculus_3": {"name": "Calculus III", "prereq_ids": ["math.calculus_2"], "tags": TAG_MATH, "difficulty": 3},
+    "math.linear_algebra": {"name": "Linear Algebra", "prereq_ids": ["math.algebra"], "tags": TAG_MATH, "difficulty": 2},
+    "math.discrete": {"name": "Discrete Mathematics", "prereq_ids": ["math.algebra"], "tags": TAG_MATH, "difficulty": 2},
+    "math.stats": {"name": "Statistics", "prereq_ids": ["math.algebra"], "tags": TAG_MATH, "difficulty": 2},
+}
 
 # Add Chemistry basics
-add_skill("chem.general", "General Chemistry", [], ["chemistry"], 2)
-add_skill("chem.organic", "Organic Chemistry", ["chem.general"], ["chemistry"], 3)
-add_skill("chem.physical", "Physical Chemistry", ["chem.general", "math.calculus_2"], ["chemistry"], 4)
+chem_skills = {
+    "chem.general": {"name": "General Chemistry", "prereq_ids": [], "tags": TAG_CHEMISTRY, "difficulty": 2},
+    "chem.organic": {"name": "Organic Chemistry", "prereq_ids": ["chem.general"], "tags": TAG_CHEMISTRY, "difficulty": 3},
+    "chem.physical": {"name": "Physical Chemistry", "prereq_ids": ["chem.general", "math.calculus_2"], "tags": TAG_CHEMISTRY, "difficulty": 4},
+}
 
-# Add Biology basics  
-add_skill("bio.general", "General Biology", [], ["biology"], 2)
-add_skill("bio.cell", "Cell Biology", ["bio.general"], ["biology"], 3)
-add_skill("bio.genetics", "Genetics", ["bio.general"], ["biology"], 3)
-add_skill("bio.molecular", "Molecular Biology", ["bio.cell"], ["biology"], 4)
+# Add Biology basics
+bio_skills = {
+    "bio.general": {"name": "General Biology", "prereq_ids": [], "tags": TAG_BIOLOGY, "difficulty": 2},
+    "bio.cell": {"name": "Cell Biology", "prereq_ids": ["bio.general"], "tags": TAG_BIOLOGY, "difficulty": 3},
+    "bio.genetics": {"name": "Genetics", "prereq_ids": ["bio.general"], "tags": TAG_BIOLOGY, "difficulty": 3},
+    "bio.molecular": {"name": "Molecular Biology", "prereq_ids": ["bio.cell"], "tags": TAG_BIOLOGY, "difficulty": 4},
+}
 
 # Medicine skills
-med_skills = [
-    ("med.anatomy", "Human Anatomy", [], ["medicine"], 3),
-    ("med.physiology", "Physiology", ["med.anatomy"], ["medicine"], 3),
-    ("med.biochem", "Medical Biochemistry", ["chem.organic", "bio.cell"], ["medicine"], 3),
-    ("med.pathology", "Pathology", ["med.physiology"], ["medicine"], 4),
-    ("med.pharmacology", "Pharmacology", ["med.physiology", "chem.organic"], ["medicine"], 4),
-    ("med.microbiology", "Microbiology", ["bio.general"], ["medicine"], 3),
-]
-for s in med_skills:
-    add_skill(*s)
+med_skills = {
+    "med.anatomy": {"name": "Human Anatomy", "prereq_ids": [], "tags": TAG_MEDICINE, "difficulty": 3},
+    "med.physiology": {"name": "Physiology", "prereq_ids": ["med.anatomy"], "tags": TAG_MEDICINE, "difficulty": 3},
+    "med.biochem": {"name": "Medical Biochemistry", "prereq_ids": ["chem.organic", "bio.cell"], "tags": TAG_MEDICINE, "difficulty": 3},
+    "med.pathology": {"name": "Pathology", "prereq_ids": ["med.physiology"], "tags": TAG_MEDICINE, "difficulty": 4},
+    "med.pharmacology": {"name": "Pharmacology", "prereq_ids": ["med.physiology", "chem.organic"], "tags": TAG_MEDICINE, "difficulty": 4},
+    "med.microbiology": {"name": "Microbiology", "prereq_ids": ["bio.general"], "tags": TAG_MEDICINE, "difficulty": 3},
+}
 
 # Nursing skills
-nursing_skills = [
-    ("nurse.fundamentals", "Nursing Fundamentals", [], ["nursing"], 2),
-    ("nurse.pathophys", "Pathophysiology", ["med.anatomy"], ["nursing"], 3),
-    ("nurse.pharmacology", "Nursing Pharmacology", ["nurse.pathophys"], ["nursing"], 3),
-    ("nurse.clinical", "Clinical Practice", ["nurse.fundamentals"], ["nursing"], 3),
-]
-for s in nursing_skills:
-    add_skill(*s)
+nursing_skills = {
+    "nurse.fundamentals": {"name": "Nursing Fundamentals", "prereq_ids": [], "tags": TAG_NURSING, "difficulty": 2},
+    "nurse.pathophys": {"name": "Pathophysiology", "prereq_ids": ["med.anatomy"], "tags": TAG_NURSING, "difficulty": 3},
+    "nurse.pharmacology": {"name": "Nursing Pharmacology", "prereq_ids": ["nurse.pathophys"], "tags": TAG_NURSING, "difficulty": 3},
+    "nurse.clinical": {"name": "Clinical Practice", "prereq_ids": ["nurse.fundamentals"], "tags": TAG_NURSING, "difficulty": 3},
+}
 
 # Mechanical Engineering
-me_skills = [
-    ("me.statics", "Statics", ["math.calculus_1"], ["mech"], 2),
-    ("me.dynamics", "Dynamics", ["me.statics"], ["mech"], 3),
-    ("me.thermo", "Thermodynamics", ["math.calculus_2"], ["mech"], 3),
-    ("me.fluids", "Fluid Mechanics", ["math.calculus_3"], ["mech"], 3),
-    ("me.heat_transfer", "Heat Transfer", ["me.thermo"], ["mech"], 3),
-    ("me.design", "Machine Design", ["me.dynamics"], ["mech"], 3),
-]
-for s in me_skills:
-    add_skill(*s)
+me_skills = {
+    "me.statics": {"name": "Statics", "prereq_ids": ["math.calculus_1"], "tags": TAG_MECH, "difficulty": 2},
+    "me.dynamics": {"name": "Dynamics", "prereq_ids": ["me.statics"], "tags": TAG_MECH, "difficulty": 3},
+    "me.thermo": {"name": "Thermodynamics", "prereq_ids": ["math.calculus_2"], "tags": TAG_MECH, "difficulty": 3},
+    "me.fluids": {"name": "Fluid Mechanics", "prereq_ids": ["math.calculus_3"], "tags": TAG_MECH, "difficulty": 3},
+    "me.heat_transfer": {"name": "Heat Transfer", "prereq_ids": ["me.thermo"], "tags": TAG_MECH, "difficulty": 3},
+    "me.design": {"name": "Machine Design", "prereq_ids": ["me.dynamics"], "tags": TAG_MECH, "difficulty": 3},
+}
 
 # Civil Engineering
-civil_skills = [
-    ("civil.structural", "Structural Analysis", ["me.statics"], ["civil"], 3),
-    ("civil.soils", "Soil Mechanics", ["math.calculus_2"], ["civil"], 3),
-    ("civil.hydrology", "Hydrology", ["math.calculus_2"], ["civil"], 3),
-    ("civil.transport", "Transportation Engineering", [], ["civil"], 2),
-    ("civil.concrete", "Concrete Design", ["civil.structural"], ["civil"], 3),
-]
-for s in civil_skills:
-    add_skill(*s)
+civil_skills = {
+    "civil.structural": {"name": "Structural Analysis", "prereq_ids": ["me.statics"], "tags": TAG_CIVIL, "difficulty": 3},
+    "civil.soils": {"name": "Soil Mechanics", "prereq_ids": ["math.calculus_2"], "tags": TAG_CIVIL, "difficulty": 3},
+    "civil.hydrology": {"name": "Hydrology", "prereq_ids": ["math.calculus_2"], "tags": TAG_CIVIL, "difficulty": 3},
+    "civil.transport": {"name": "Transportation Engineering", "prereq_ids": [], "tags": TAG_CIVIL, "difficulty": 2},
+    "civil.concrete": {"name": "Concrete Design", "prereq_ids": ["civil.structural"], "tags": TAG_CIVIL, "difficulty": 3},
+}
 
 # Chemical Engineering
-chemeng_skills = [
-    ("che.balances", "Material & Energy Balances", ["chem.general"], ["chemeng"], 2),
-    ("che.thermo", "Chemical Thermodynamics", ["chem.physical"], ["chemeng"], 3),
-    ("che.transport", "Transport Phenomena", ["math.calculus_3"], ["chemeng"], 4),
-    ("che.kinetics", "Reaction Kinetics", ["che.thermo"], ["chemeng"], 3),
-    ("che.control", "Process Control", ["che.balances"], ["chemeng"], 3),
-]
-for s in chemeng_skills:
-    add_skill(*s)
+chemeng_skills = {
+    "che.balances": {"name": "Material & Energy Balances", "prereq_ids": ["chem.general"], "tags": TAG_CHEMENG, "difficulty": 2},
+    "che.thermo": {"name": "Chemical Thermodynamics", "prereq_ids": ["chem.physical"], "tags": TAG_CHEMENG, "difficulty": 3},
+    "che.transport": {"name": "Transport Phenomena", "prereq_ids": ["math.calculus_3"], "tags": TAG_CHEMENG, "difficulty": 4},
+    "che.kinetics": {"name": "Reaction Kinetics", "prereq_ids": ["che.thermo"], "tags": TAG_CHEMENG, "difficulty": 3},
+    "che.control": {"name": "Process Control", "prereq_ids": ["che.balances"], "tags": TAG_CHEMENG, "difficulty": 3},
+}
 
 # Environmental Science
-env_skills = [
-    ("env.chemistry", "Environmental Chemistry", ["chem.general"], ["environment"], 3),
-    ("env.air", "Air Quality", ["math.calculus_2"], ["environment"], 3),
-    ("env.water", "Water Treatment", ["chem.general"], ["environment"], 3),
-    ("env.climate", "Climate Science", ["math.stats"], ["environment"], 3),
-]
-for s in env_skills:
-    add_skill(*s)
+env_skills = {
+    "env.chemistry": {"name": "Environmental Chemistry", "prereq_ids": ["chem.general"], "tags": TAG_ENVIRONMENT, "difficulty": 3},
+    "env.air": {"name": "Air Quality", "prereq_ids": ["math.calculus_2"], "tags": TAG_ENVIRONMENT, "difficulty": 3},
+    "env.water": {"name": "Water Treatment", "prereq_ids": ["chem.general"], "tags": TAG_ENVIRONMENT, "difficulty": 3},
+    "env.climate": {"name": "Climate Science", "prereq_ids": ["math.stats"], "tags": TAG_ENVIRONMENT, "difficulty": 3},
+}
 
 # Law skills
-law_skills = [
-    ("law.contracts", "Contracts", [], ["law"], 3),
-    ("law.torts", "Torts", [], ["law"], 3),
-    ("law.criminal", "Criminal Law", [], ["law"], 3),
-    ("law.constitutional", "Constitutional Law", [], ["law"], 3),
-    ("law.civil_procedure", "Civil Procedure", [], ["law"], 3),
-]
-for s in law_skills:
-    add_skill(*s)
+law_skills = {
+    "law.contracts": {"name": "Contracts", "prereq_ids": [], "tags": TAG_LAW, "difficulty": 3},
+    "law.torts": {"name": "Torts", "prereq_ids": [], "tags": TAG_LAW, "difficulty": 3},
+    "law.criminal": {"name": "Criminal Law", "prereq_ids": [], "tags": TAG_LAW, "difficulty": 3},
+    "law.constitutional": {"name": "Constitutional Law", "prereq_ids": [], "tags": TAG_LAW, "difficulty": 3},
+    "law.civil_procedure": {"name": "Civil Procedure", "prereq_ids": [], "tags": TAG_LAW, "difficulty": 3},
+}
 
 # Economics skills
-econ_skills = [
-    ("econ.micro", "Microeconomics", ["math.calculus_1"], ["economics"], 3),
-    ("econ.macro", "Macroeconomics", ["math.calculus_1"], ["economics"], 3),
-    ("econ.econometrics", "Econometrics", ["math.stats"], ["economics"], 4),
-    ("econ.finance", "Financial Economics", ["econ.micro"], ["economics"], 3),
-]
-for s in econ_skills:
-    add_skill(*s)
+econ_skills = {
+    "econ.micro": {"name": "Microeconomics", "prereq_ids": ["math.calculus_1"], "tags": TAG_ECONOMICS, "difficulty": 3},
+    "econ.macro": {"name": "Macroeconomics", "prereq_ids": ["math.calculus_1"], "tags": TAG_ECONOMICS, "difficulty": 3},
+    "econ.econometrics": {"name": "Econometrics", "prereq_ids": ["math.stats"], "tags": TAG_ECONOMICS, "difficulty": 4},
+    "econ.finance": {"name": "Financial Economics", "prereq_ids": ["econ.micro"], "tags": TAG_ECONOMICS, "difficulty": 3},
+}
 
 # Education skills
-edu_skills = [
-    ("edu.learning", "Learning Theories", [], ["education"], 2),
-    ("edu.curriculum", "Curriculum Design", [], ["education"], 2),
-    ("edu.assessment", "Assessment Methods", [], ["education"], 3),
-    ("edu.technology", "Educational Technology", [], ["education"], 2),
-]
-for s in edu_skills:
-    add_skill(*s)
+edu_skills = {
+    "edu.learning": {"name": "Learning Theories", "prereq_ids": [], "tags": TAG_EDUCATION, "difficulty": 2},
+    "edu.curriculum": {"name": "Curriculum Design", "prereq_ids": [], "tags": TAG_EDUCATION, "difficulty": 2},
+    "edu.assessment": {"name": "Assessment Methods", "prereq_ids": [], "tags": TAG_EDUCATION, "difficulty": 3},
+    "edu.technology": {"name": "Educational Technology", "prereq_ids": [], "tags": TAG_EDUCATION, "difficulty": 2},
+}
 
 # Architecture skills
-arch_skills = [
-    ("arch.design", "Architectural Design", [], ["architecture"], 3),
-    ("arch.structures", "Building Structures", ["me.statics"], ["architecture"], 3),
-    ("arch.sustainable", "Sustainable Design", [], ["architecture"], 3),
-    ("arch.urban", "Urban Planning", [], ["architecture"], 2),
-]
-for s in arch_skills:
-    add_skill(*s)
+arch_skills = {
+    "arch.design": {"name": "Architectural Design", "prereq_ids": [], "tags": TAG_ARCHITECTURE, "difficulty": 3},
+    "arch.structures": {"name": "Building Structures", "prereq_ids": ["me.statics"], "tags": TAG_ARCHITECTURE, "difficulty": 3},
+    "arch.sustainable": {"name": "Sustainable Design", "prereq_ids": [], "tags": TAG_ARCHITECTURE, "difficulty": 3},
+    "arch.urban": {"name": "Urban Planning", "prereq_ids": [], "tags": TAG_ARCHITECTURE, "difficulty": 2},
+}
 
 # Communications skills
-comm_skills = [
-    ("comm.writing", "News Writing", [], ["communications"], 2),
-    ("comm.media", "Media Studies", [], ["communications"], 2),
-    ("comm.investigative", "Investigative Reporting", ["comm.writing"], ["communications"], 3),
-    ("comm.data", "Data Journalism", ["math.stats"], ["communications"], 3),
-]
-for s in comm_skills:
-    add_skill(*s)
+comm_skills = {
+    "comm.writing": {"name": "News Writing", "prereq_ids": [], "tags": TAG_COMMUNICATIONS, "difficulty": 2},
+    "comm.media": {"name": "Media Studies", "prereq_ids": [], "tags": TAG_COMMUNICATIONS, "difficulty": 2},
+    "comm.investigative": {"name": "Investigative Reporting", "prereq_ids": ["comm.writing"], "tags": TAG_COMMUNICATIONS, "difficulty": 3},
+    "comm.data": {"name": "Data Journalism", "prereq_ids": ["math.stats"], "tags": TAG_COMMUNICATIONS, "difficulty": 3},
+}
+
+# Merge every category with a single bulk update, skipping ids already on
+# disk; update() sizes the table once from the full batch instead of growing
+# it category by category
+skill_batches = (math_skills, chem_skills, bio_skills, med_skills, nursing_skills,
+                 me_skills, civil_skills, chemeng_skills, env_skills, law_skills,
+                 econ_skills, edu_skills, arch_skills, comm_skills)
+added_skills = {sid: Skill(skill_id=sys.intern(sid), **fields)
+                for batch in skill_batches
+                for sid, fields in batch.items() if sid not in skills}
+skills.update(added_skills)
+dirty["skills"] = bool(added_skills)
 
 # Add comprehensive modules for each major
 new_modules = [
@@ -235,10 +326,10 @@ new_modules = [
 ]
 
 # Add modules if they don't exist
-existing_modules = {m["module_id"] for m in modules}
 for module in new_modules:
-    if module["module_id"] not in existing_modules:
-        modules.append(module)
+    record = Module(**module)
+    if modules.setdefault(module["module_id"], record) is record:
+        dirty["modules"] = True
 
 # Add comprehensive resources
 new_resources = [
@@ -334,20 +425,53 @@ new_resources = [
 ]
 
 # Add resources if they don't exist
-existing_resources = {r["resource_id"] for r in resources}
 for resource in new_resources:
-    if resource["resource_id"] not in existing_resources:
-        resources.append(resource)
+    record = Resource(**resource)
+    if resources.setdefault(resource["resource_id"], record) is record:
+        dirty["resources"] = True
+
+# Validate the prerequisite graph in one O(V+E) Kahn pass: every prereq
+# must exist and the graph must be acyclic
+def validate_prereqs(skills):
+    indegree = dict.fromkeys(skills, 0)
+    dependents = defaultdict(list)
+    missing = []
+    for sid, record in skills.items():
+        for pid in record.prereq_ids:
+            if pid not in indegree:
+                missing.append((sid, pid))
+                continue
+            indegree[sid] += 1
+            dependents[pid].append(sid)
 
-# Save updated data
-with open(os.path.join(data_dir, "skills.json"), "w") as f:
-    json.dump(skills, f, indent=2)
+    queue = deque(sid for sid, degree in indegree.items() if degree == 0)
+    visited = 0
+    while queue:
+        visited += 1
+        for dependent in dependents[queue.popleft()]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                queue.append(dependent)
+    cyclic = [sid for sid, degree in indegree.items() if degree > 0]
+    return missing, cyclic
 
-with open(os.path.join(data_dir, "modules.json"), "w") as f:
-    json.dump(modules, f, indent=2)
+missing_prereqs, cyclic_skills = validate_prereqs(skills)
+for sid, pid in missing_prereqs:
+    print(f"⚠️  {sid} lists unknown prerequisite {pid}")
+if cyclic_skills:
+    print(f"⚠️  Prerequisite cycle among: {', '.join(cyclic_skills)}")
 
-with open(os.path.join(data_dir, "resources.json"), "w") as f:
-    json.dump(resources, f, indent=2)
+# Save updated data, rewriting only the collections that gained records.
+# The files are independent, so write them concurrently
+pending = [(path, list(collection.values()))
+           for name, path, collection in (("skills", SKILLS_PATH, skills),
+                                          ("modules", MODULES_PATH, modules),
+                                          ("resources", RESOURCES_PATH, resources))
+           if dirty[name]]
+if pending:
+    with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+        list(executor.map(lambda job: dump_json(*job), pending))
+STATE_PATH.write_text(extend_state())
 
 print(f"✅ Updated backend data:")
 print(f"   - {len(skills)} total skills")
@@ -367,5 +491,4 @@ majors = ["Computer Science", "Data Science", "Electrical Engineering", "Mechani
           "Chemistry", "Materials Science", "Environmental Science", "Medicine", "Nursing",
           "Pharmacy", "Public Health", "Nutrition", "Economics", "Finance", "Political Science",
           "Education", "Psychology", "Architecture", "Communications", "Law", "Criminal Justice"]
-for i, major in enumerate(majors, 1):
-    print(f"   {i}. {major}")
\ No newline at end of file
+sys.stdout.write("".join(f"   {i}. {major}\n" for i, major in enumerate(majors, 1)))
\ No newline at end of file
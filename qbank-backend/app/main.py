@@ -2,6 +2,8 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional
+from collections import defaultdict
+from dataclasses import dataclass, field
 import random
 import numpy as np
 
@@ -18,6 +20,8 @@ app.add_middleware(
 
 # In-memory storage (replace with database in production)
 questions_db = []
+questions_arr = {}  # SoA view of questions_db item parameters, built at startup
+topic_to_ids = defaultdict(list)  # topic -> indices into questions_db
 sessions = {}
 
 class Question(BaseModel):
@@ -40,14 +44,34 @@ class Answer(BaseModel):
     question_id: int
     selected: int
 
+class AnswerBatch(BaseModel):
+    answers: List[Answer]
+
+@dataclass(slots=True)
+class Session:
+    """In-memory quiz session state"""
+    question_ids: List[int]
+    current: int = 0
+    responses: List[dict] = field(default_factory=list)
+    theta: float = 0.0
+    mode: str = "adaptive"
+
 @app.on_event("startup")
 async def startup():
     """Initialize question database"""
     global questions_db
     
-    # Generate sample questions
+    # Generate sample question parameters in bulk
+    n = 5000
+    rng = np.random.default_rng()
+    difficulty = rng.random(n)
+    a_vals = 0.5 + rng.random(n) * 2
+    b_vals = -2 + rng.random(n) * 4
+    c_vals = rng.random(n) * 0.3
+    
     topics = ["math", "science", "english"]
-    for i in range(5000):
+    for i, (diff, a, b, c) in enumerate(zip(difficulty.tolist(), a_vals.tolist(),
+                                            b_vals.tolist(), c_vals.tolist())):
         topic = topics[i % 3]
         questions_db.append({
             "id": i,
@@ -55,11 +79,22 @@ async def startup():
             "options": [f"Option A", f"Option B", f"Option C", f"Option D"],
             "correct": i % 4,
             "topic": topic,
-            "difficulty": random.random(),
-            "a": 0.5 + random.random() * 2,
-            "b": -2 + random.random() * 4,
-            "c": random.random() * 0.3
+            "difficulty": diff,
+            "a": a,
+            "b": b,
+            "c": c
         })
+        topic_to_ids[topic].append(i)
+    
+    # Contiguous float32 parameter arrays so IRT scoring can run over the
+    # whole bank in one vectorized expression
+    questions_arr.update(
+        id=np.arange(n),
+        a=a_vals.astype(np.float32),
+        b=b_vals.astype(np.float32),
+        c=c_vals.astype(np.float32),
+        d=np.ones(n, dtype=np.float32)
+    )
 
 @app.get("/")
 async def root():
@@ -70,56 +105,49 @@ async def start_quiz(config: QuizConfig):
     """Start a new quiz session"""
     session_id = str(random.randint(10000, 99999))
     
-    # Select questions
-    filtered = questions_db
-    if config.topic:
-        filtered = [q for q in questions_db if q["topic"] == config.topic]
+    # Select questions by index from the precomputed topic index; sessions
+    # keep only the indices and dereference questions_db on demand
+    pool = topic_to_ids.get(config.topic, []) if config.topic else range(len(questions_db))
+    selected = random.sample(pool, min(config.num_questions, len(pool)))
     
-    selected = random.sample(filtered, min(config.num_questions, len(filtered)))
-    
-    sessions[session_id] = {
-        "questions": selected,
-        "current": 0,
-        "responses": [],
-        "theta": 0.0,
-        "mode": config.mode
-    }
+    sessions[session_id] = Session(question_ids=selected, mode=config.mode)
     
     return {
         "session_id": session_id,
-        "first_question": selected[0] if selected else None,
+        "first_question": questions_db[selected[0]] if selected else None,
         "total_questions": len(selected)
     }
 
 @app.get("/api/quiz/{session_id}/next")
 async def get_next_question(session_id: str):
     """Get next question in quiz"""
-    if session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = sessions[session_id]
-    if session["current"] >= len(session["questions"]):
+    if session.current >= len(session.question_ids):
         return {"completed": True, "score": calculate_score(session)}
     
-    question = session["questions"][session["current"]]
+    question = questions_db[session.question_ids[session.current]]
     return {
         "question": question,
-        "position": session["current"] + 1,
-        "total": len(session["questions"])
+        "position": session.current + 1,
+        "total": len(session.question_ids)
     }
 
 @app.post("/api/quiz/{session_id}/answer")
 async def submit_answer(session_id: str, answer: Answer):
     """Submit answer and get next question"""
-    if session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = sessions[session_id]
-    question = session["questions"][session["current"]]
+    idx = session.question_ids[session.current]
+    question = questions_db[idx]
     is_correct = answer.selected == question["correct"]
     
     # Store response
-    session["responses"].append({
+    session.responses.append({
         "question_id": answer.question_id,
         "selected": answer.selected,
         "correct": question["correct"],
@@ -127,42 +155,84 @@ async def submit_answer(session_id: str, answer: Answer):
     })
     
     # Update theta for adaptive mode
-    if session["mode"] == "adaptive":
-        # Simple IRT update
-        p = 1 / (1 + np.exp(-question["a"] * (session["theta"] - question["b"])))
-        session["theta"] += (1 if is_correct else 0 - p) * 0.3
-        session["theta"] = max(-3, min(3, session["theta"]))
+    if session.mode == "adaptive":
+        # Simple IRT update from the startup parameter arrays
+        a, b = float(questions_arr["a"][idx]), float(questions_arr["b"][idx])
+        p = 1 / (1 + np.exp(-a * (session.theta - b)))
+        session.theta += (1 if is_correct else 0 - p) * 0.3
+        session.theta = max(-3, min(3, session.theta))
     
-    session["current"] += 1
+    session.current += 1
     
     return {
         "correct": is_correct,
         "correct_answer": question["correct"],
-        "theta": session["theta"],
-        "next_question": session["questions"][session["current"]] if session["current"] < len(session["questions"]) else None
+        "theta": session.theta,
+        "next_question": questions_db[session.question_ids[session.current]] if session.current < len(session.question_ids) else None
+    }
+
+@app.post("/api/quiz/{session_id}/answer_batch")
+async def submit_answer_batch(session_id: str, batch: AnswerBatch):
+    """Submit several answers at once with a single theta update"""
+    session = sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    start = session.current
+    end = start + len(batch.answers)
+    if end > len(session.question_ids):
+        raise HTTPException(status_code=400, detail="More answers than remaining questions")
+    
+    results = []
+    for idx, answer in zip(session.question_ids[start:end], batch.answers):
+        question = questions_db[idx]
+        is_correct = answer.selected == question["correct"]
+        session.responses.append({
+            "question_id": answer.question_id,
+            "selected": answer.selected,
+            "correct": question["correct"],
+            "is_correct": is_correct
+        })
+        results.append({"correct": is_correct, "correct_answer": question["correct"]})
+    
+    # Update theta for adaptive mode: one vectorized IRT evaluation over the
+    # whole batch, then a single step on the aggregated residual
+    if session.mode == "adaptive" and results:
+        ids = np.asarray(session.question_ids[start:end])
+        p = 1 / (1 + np.exp(-questions_arr["a"][ids] * (session.theta - questions_arr["b"][ids])))
+        correct = np.fromiter((r["correct"] for r in results), dtype=bool, count=len(results))
+        residual = np.where(correct, 1.0, -p).sum()
+        session.theta = max(-3, min(3, session.theta + float(residual) * 0.3))
+    
+    session.current = end
+    
+    return {
+        "results": results,
+        "theta": session.theta,
+        "next_question": questions_db[session.question_ids[session.current]] if session.current < len(session.question_ids) else None
     }
 
 @app.get("/api/quiz/{session_id}/results")
 async def get_results(session_id: str):
     """Get quiz results"""
-    if session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = sessions[session_id]
-    correct = sum(1 for r in session["responses"] if r["is_correct"])
-    total = len(session["responses"])
+    correct = sum(1 for r in session.responses if r["is_correct"])
+    total = len(session.responses)
     
     return {
         "score": (correct / total * 100) if total > 0 else 0,
         "correct": correct,
         "total": total,
-        "theta": session["theta"],
-        "responses": session["responses"]
+        "theta": session.theta,
+        "responses": session.responses
     }
 
 def calculate_score(session):
-    correct = sum(1 for r in session["responses"] if r["is_correct"])
-    total = len(session["responses"])
+    correct = sum(1 for r in session.responses if r["is_correct"])
+    total = len(session.responses)
     return (correct / total * 100) if total > 0 else 0
 
 if __name__ == "__main__":
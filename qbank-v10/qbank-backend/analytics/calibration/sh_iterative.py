@@ -1,15 +1,140 @@
 """
 Enhanced Sympson-Hetter Iterative Calibration
 """
+import copy
+import math
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from itertools import repeat
 import numpy as np
 import psycopg2
-from typing import Dict, List, Tuple, Optional, Any
+from scipy.special import expit
+from psycopg2.extras import execute_values
+from typing import Dict, List, Tuple, Optional, Any, Union
 import json
 import logging
 from dataclasses import dataclass
 
+from app.services.adaptive import FASTMATH
+
+try:
+    from numba import njit, prange
+except ImportError:  # simulation falls back to the NumPy selection loop
+    njit = None
+    prange = range
+
 logger = logging.getLogger(__name__)
 
+# Candidates gated up front by the NumPy selection path
+SELECT_TOP_K = 32
+
+# Pools larger than this share candidate sets across simulees of similar
+# ability instead of scanning the full pool for every simulee
+BLOCK_POOL_SIZE = 10_000
+THETA_BUCKET_WIDTH = 0.1
+
+# The NumPy path splits simulees into this many seeded chunks whatever the
+# worker count, so a seeded run gives the same counts on any machine
+SIM_CHUNKS = 64
+
+# Worker pools by size, kept across calibrate() calls
+_executors: Dict[int, ProcessPoolExecutor] = {}
+
+
+def _shared_executor(n_workers: int) -> ProcessPoolExecutor:
+    """Process pool with ``n_workers`` workers, created on first use.
+    
+    A long-lived pool may start workers after the parent has started
+    threads, so workers come from a fork server where there is one.
+    """
+    executor = _executors.get(n_workers)
+    if executor is None:
+        context = None
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+        executor = _executors[n_workers] = ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=context
+        )
+    return executor
+
+
+def _topic_key(topic_id: Any) -> Optional[str]:
+    """Key into topic_tau for a topic id; items without a topic use the global tau"""
+    return str(topic_id) if topic_id else None
+
+
+def _fisher_info_3pl_scalar(theta, Da, Dab, c):
+    """Fisher information of one 3PL item, matching _fisher_info_3pl_vec"""
+    # Stable logistic: exp() only ever sees a non-positive argument
+    z = Da * theta - Dab
+    if z >= 0:
+        sig = 1 / (1 + math.exp(-z))
+    else:
+        ez = math.exp(z)
+        sig = ez / (1 + ez)
+    p = c + (1 - c) * sig
+    q = 1 - p
+    if p <= 0 or q <= 0:
+        return 0.0
+    return (Da * Da) * (q / p) * sig * sig
+
+
+def _simulate_kernel(thetas, seeds, Da, Dab, c, shp, test_length, counts):
+    """Sympson-Hetter administrations for all simulees
+    
+    Simulees run in parallel; each reseeds the generator from ``seeds`` so
+    results do not depend on thread scheduling. Exposure counts per pool
+    position are added into ``counts``.
+    """
+    n_items = Da.size
+    n_simulees = thetas.size
+    picks = np.full((n_simulees, test_length), -1, dtype=np.int64)
+    
+    for s in prange(n_simulees):
+        np.random.seed(seeds[s])
+        theta = thetas[s]
+        
+        # Information does not change within a test, so rank items once
+        info = np.empty(n_items)
+        for i in range(n_items):
+            info[i] = -_fisher_info_3pl_scalar(theta, Da[i], Dab[i], c[i])
+        order = np.argsort(info, kind="mergesort")
+        
+        avail = np.ones(n_items, dtype=np.bool_)
+        for step in range(test_length):
+            selected = -1
+            fallback = -1
+            for j in range(n_items):
+                idx = order[j]
+                if not avail[idx]:
+                    continue
+                if fallback < 0:
+                    fallback = idx
+                if np.random.random() <= shp[idx]:
+                    selected = idx
+                    break
+            if selected < 0:
+                selected = fallback
+            if selected < 0:
+                break
+            avail[selected] = False
+            picks[s, step] = selected
+    
+    for s in range(n_simulees):
+        for step in range(test_length):
+            if picks[s, step] >= 0:
+                counts[picks[s, step]] += 1
+
+
+# Kernels are cached on disk across runs. FASTMATH keeps inf/NaN semantics,
+# so degenerate item parameters still fall through to the p/q guards
+if njit is not None:
+    _fisher_info_3pl_scalar = njit(cache=True, fastmath=FASTMATH)(_fisher_info_3pl_scalar)
+    _simulate_kernel = njit(parallel=True, cache=True, fastmath=FASTMATH)(_simulate_kernel)
+
 @dataclass
 class ExposureControlParams:
     """Parameters for Sympson-Hetter exposure control."""
@@ -23,6 +148,69 @@ class ExposureControlParams:
     ceiling: float = 1.0  # Maximum exposure probability
     topic_tau: Optional[Dict[str, float]] = None  # Topic-specific targets
     topic_weights: Optional[Dict[str, float]] = None  # Topic weights
+    n_workers: Optional[int] = None  # Processes for the NumPy simulation (None = CPU count)
+
+@dataclass
+class ItemPool:
+    """Item pool as parallel arrays (structure of arrays), one entry per item."""
+    question_id: np.ndarray  # int64
+    version: np.ndarray  # int64
+    topic_key: np.ndarray  # object; str topic key, None for items without a topic
+    a: np.ndarray  # float64 discrimination
+    b: np.ndarray  # float64 difficulty
+    c: np.ndarray  # float64 guessing
+    sh_p: np.ndarray  # float64 exposure control parameter
+    
+    def __len__(self) -> int:
+        return len(self.a)
+    
+    def keys(self) -> List[Tuple[int, int]]:
+        """(question_id, version) for every item, in pool order."""
+        return list(zip(self.question_id.tolist(), self.version.tolist()))
+    
+    @classmethod
+    def from_items(cls, items: List[Dict[str, Any]]) -> "ItemPool":
+        """Build a pool from item dicts, applying the 3PL parameter defaults."""
+        n = len(items)
+        
+        def column(name: str, default: float = 0.0, dtype=float) -> np.ndarray:
+            return np.fromiter(
+                (item.get(name, default) for item in items), dtype=dtype, count=n
+            )
+        
+        topic_key = np.empty(n, dtype=object)
+        topic_key[:] = [
+            item["topic_key"] if "topic_key" in item else _topic_key(item.get("topic_id"))
+            for item in items
+        ]
+        return cls(
+            question_id=column("question_id", dtype=np.int64),
+            version=column("version", dtype=np.int64),
+            topic_key=topic_key,
+            a=column("a", 1.0),
+            b=column("b", 0.0),
+            c=column("c", 0.2),
+            sh_p=column("sh_p", 1.0)
+        )
+
+
+def _simulate_chunk(
+    calibrator: "SympsonHetterCalibrator",
+    thetas: np.ndarray,
+    shp_arr: np.ndarray,
+    seed: int
+) -> np.ndarray:
+    """Simulate one chunk of simulees with its own generator.
+    
+    Runs in a pool worker or in-process; the calibrator is copied so the
+    caller's generator is left alone either way.
+    """
+    calibrator = copy.copy(calibrator)
+    calibrator._rng = np.random.default_rng(seed)
+    exp_counts = np.zeros(len(shp_arr), dtype=np.int32)
+    calibrator._simulate_serial(thetas, shp_arr, exp_counts)
+    return exp_counts
+
 
 class SympsonHetterCalibrator:
     """Enhanced Sympson-Hetter exposure control calibrator."""
@@ -30,72 +218,77 @@ class SympsonHetterCalibrator:
     def __init__(self, params: ExposureControlParams):
         self.params = params
         self.D = 1.7
+        self._theta_dist = self._parse_dist(params.theta_dist)
+        self._topic_tau = self._compute_topic_tau()
+        self._rng = np.random.default_rng()
     
     def calibrate(
         self,
-        pool: List[Dict[str, Any]],
+        pool: Union[ItemPool, List[Dict[str, Any]]],
         seed: Optional[int] = None
     ) -> Tuple[Dict[Tuple[int, int], float], List[Dict], List[Dict]]:
         """
         Run iterative Sympson-Hetter calibration.
         
+        ``pool`` is an ItemPool, or a list of item dicts converted to one.
+        
         Returns:
             - k_map: Dictionary of (question_id, version) -> sh_p values
             - exposure_history: List of exposure statistics per iteration
             - convergence_history: List of convergence metrics
         """
         if seed is not None:
-            np.random.seed(seed)
+            self._rng = np.random.default_rng(seed)
         
-        # Initialize k values
-        k_map = {
-            (item["question_id"], item["version"]): item.get("sh_p", 1.0)
-            for item in pool
-        }
+        if not isinstance(pool, ItemPool):
+            pool = ItemPool.from_items(pool)
+        
+        # Initialize k values, indexed by pool position
+        k_arr = pool.sh_p.astype(float)
+        self._prepare_items(pool.a, pool.b, pool.c)
         
         exposure_history = []
         convergence_history = []
         
         # Compute topic-specific targets
-        topic_tau = self._compute_topic_tau()
+        target_arr = self._target_rates(pool, self._topic_tau)
         
-        for iteration in range(self.params.iterations):
-            logger.info(f"Iteration {iteration + 1}/{self.params.iterations}")
-            
-            # Update pool with current k values
-            for item in pool:
-                key = (item["question_id"], item["version"])
-                item["sh_p"] = k_map[key]
-            
-            # Simulate test administrations
-            exposures = self._simulate_administrations(pool)
-            
-            # Calculate exposure rates
-            rates = {
-                key: count / self.params.n_simulees
-                for key, count in exposures.items()
-            }
-            
-            # Update k values
-            new_k_map = self._update_k_values(
-                pool, k_map, rates, topic_tau
-            )
-            
-            # Calculate statistics
-            stats = self._calculate_statistics(rates, topic_tau, pool)
-            exposure_history.append(stats)
-            
-            # Check convergence
-            convergence = self._check_convergence(k_map, new_k_map, rates)
-            convergence_history.append(convergence)
-            
-            k_map = new_k_map
-            
-            # Early stopping if converged
-            if convergence["converged"]:
-                logger.info(f"Converged at iteration {iteration + 1}")
-                break
+        # Exposure counts, reused across iterations
+        exp_counts = np.zeros(len(pool), dtype=np.int32)
         
+        # Without Numba, simulees are spread over worker processes
+        with self._simulation_pool() as executor:
+            for iteration in range(self.params.iterations):
+                logger.info(f"Iteration {iteration + 1}/{self.params.iterations}")
+                
+                # Update pool with current k values
+                pool.sh_p[:] = k_arr
+                
+                # Simulate test administrations
+                exp_counts.fill(0)
+                self._simulate_administrations(k_arr, exp_counts, executor)
+                
+                # Calculate exposure rates
+                rates = exp_counts / self.params.n_simulees
+                
+                # Update k values
+                new_k_arr = self._update_k_values(k_arr, rates, target_arr)
+                
+                # Calculate statistics and check convergence
+                stats, convergence = self._iteration_metrics(
+                    rates, target_arr, k_arr, new_k_arr
+                )
+                exposure_history.append(stats)
+                convergence_history.append(convergence)
+                
+                k_arr = new_k_arr
+                
+                # Early stopping if converged
+                if convergence["converged"]:
+                    logger.info(f"Converged at iteration {iteration + 1}")
+                    break
+        
+        k_map = dict(zip(pool.keys(), k_arr.tolist()))
         return k_map, exposure_history, convergence_history
     
     def _compute_topic_tau(self) -> Dict[str, float]:
@@ -112,47 +305,170 @@ class SympsonHetterCalibrator:
         
         return {}
     
+    def _target_rates(
+        self,
+        pool: ItemPool,
+        topic_tau: Dict[str, float]
+    ) -> np.ndarray:
+        """Target exposure rate per pool position (topic-specific or global)."""
+        if not topic_tau:
+            return np.full(len(pool), self.params.tau)
+        
+        # Map each item to a topic code, then look targets up once per topic
+        codes_by_key: Dict[Optional[str], int] = {}
+        codes = np.fromiter(
+            (codes_by_key.setdefault(key, len(codes_by_key)) for key in pool.topic_key),
+            dtype=np.intp,
+            count=len(pool)
+        )
+        topic_tau_arr = np.array([
+            topic_tau.get(key, self.params.tau) if key is not None else self.params.tau
+            for key in codes_by_key
+        ])
+        return topic_tau_arr[codes]
+    
+    def _n_workers(self) -> int:
+        """Worker processes for the NumPy simulation path."""
+        if njit is not None or multiprocessing.current_process().daemon:
+            # Numba parallelizes in-process; daemonic workers cannot fork
+            return 1
+        return max(1, self.params.n_workers or os.cpu_count() or 1)
+    
+    def _simulation_pool(self):
+        """Shared process pool for the NumPy simulation path, if any.
+        
+        The pool outlives the context so later calibrations reuse its workers.
+        """
+        n_workers = self._n_workers()
+        if n_workers > 1 and self.params.n_simulees > 1:
+            return nullcontext(_shared_executor(n_workers))
+        return nullcontext()
+    
     def _simulate_administrations(
         self,
-        pool: List[Dict[str, Any]]
-    ) -> Dict[Tuple[int, int], int]:
-        """Simulate test administrations for exposure calculation."""
-        exposures = {
-            (item["question_id"], item["version"]): 0
-            for item in pool
-        }
+        shp_arr: np.ndarray,
+        exp_counts: np.ndarray,
+        executor: Optional[Executor] = None
+    ) -> None:
+        """Simulate test administrations for exposure calculation.
         
-        for _ in range(self.params.n_simulees):
-            # Sample ability
-            theta = self._sample_theta()
-            
-            # Administer test
-            administered = set()
+        Exposure counts per pool position are added into ``exp_counts``.
+        """
+        n_items = len(shp_arr)
+        
+        # The simulation only rank-orders items, so it runs in float32
+        shp_arr = shp_arr.astype(np.float32)
+        
+        # Sample all abilities up front
+        thetas = self._sample_thetas(self.params.n_simulees).astype(np.float32)
+        
+        if njit is not None:
+            seeds = self._rng.integers(0, 2**31 - 1, size=self.params.n_simulees)
+            _simulate_kernel(
+                thetas, seeds, self._Da, self._Dab, self._c, shp_arr,
+                min(self.params.test_length, n_items), exp_counts
+            )
+            return
+        
+        # Simulees are independent given k, so chunks can run in parallel
+        # and their counts are summed
+        chunks = np.array_split(thetas, max(1, min(SIM_CHUNKS, len(thetas))))
+        seeds = self._rng.integers(0, 2**31 - 1, size=len(chunks))
+        args = (repeat(self), chunks, repeat(shp_arr), seeds)
+        if executor is None:
+            results = map(_simulate_chunk, *args)
+        else:
+            # One batch per worker pickles the calibrator once per worker
+            chunksize = -(-len(chunks) // self._n_workers())
+            results = executor.map(_simulate_chunk, *args, chunksize=chunksize)
+        try:
+            for chunk_counts in results:
+                exp_counts += chunk_counts
+        except BrokenProcessPool:
+            # A dead worker breaks the pool for good; start afresh next time
+            for n_workers, shared in list(_executors.items()):
+                if shared is executor:
+                    del _executors[n_workers]
+            raise
+    
+    def _simulate_serial(
+        self,
+        thetas: np.ndarray,
+        shp_arr: np.ndarray,
+        exp_counts: np.ndarray
+    ) -> None:
+        """Run the NumPy selection loop for the given simulee abilities."""
+        n_items = len(shp_arr)
+        if n_items > BLOCK_POOL_SIZE:
+            self._simulate_blocked(thetas, shp_arr, exp_counts)
+            return
+        
+        for theta in thetas:
+            # Administer test; avail flags items not yet given to this simulee
+            avail = np.ones(n_items, dtype=bool)
             
-            for _ in range(min(self.params.test_length, len(pool))):
-                # Get available items
-                available = [
-                    item for item in pool
-                    if (item["question_id"], item["version"]) not in administered
-                ]
-                
-                if not available:
+            for _ in range(min(self.params.test_length, n_items)):
+                if not avail.any():
                     break
                 
                 # Select item using Sympson-Hetter
-                selected = self._select_item_sh(available, theta)
+                selected = self._select_item_sh(avail, theta, shp_arr)
                 
-                if selected:
-                    key = (selected["question_id"], selected["version"])
-                    administered.add(key)
-                    exposures[key] += 1
-        
-        return exposures
+                if selected is not None:
+                    avail[selected] = False
+                    exp_counts[selected] += 1
     
-    def _sample_theta(self) -> float:
-        """Sample ability from specified distribution."""
-        dist = self.params.theta_dist
+    def _simulate_blocked(
+        self,
+        thetas: np.ndarray,
+        shp_arr: np.ndarray,
+        exp_counts: np.ndarray
+    ) -> None:
+        """Selection loop for large pools, blocked by ability bucket.
         
+        Simulees are grouped by rounded theta. Each group ranks the full
+        pool once at the bucket center and keeps the top candidates, which
+        stay cache-resident while every simulee in the group runs its test
+        on them with its own theta. A simulee whose gates reject all
+        remaining candidates finishes its test on the full pool.
+        """
+        n_items = len(shp_arr)
+        test_length = min(self.params.test_length, n_items)
+        k = min(n_items, max(SELECT_TOP_K, 8 * test_length))
+        buckets = np.round(thetas / THETA_BUCKET_WIDTH).astype(np.int64)
+        
+        for bucket in np.unique(buckets):
+            center = bucket * THETA_BUCKET_WIDTH
+            cand = np.argpartition(-self._fisher_info_3pl_vec(center), k - 1)[:k]
+            cand_shp = shp_arr[cand]
+            
+            for theta in thetas[buckets == bucket]:
+                info = self._fisher_info_3pl_vec(theta, cand)
+                avail = np.ones(k, dtype=bool)
+                
+                for step in range(test_length):
+                    passed = avail & (self._rng.random(k, dtype=np.float32) <= cand_shp)
+                    i = int(np.argmax(np.where(passed, info, -np.inf)))
+                    if not passed[i]:
+                        break
+                    avail[i] = False
+                    exp_counts[cand[i]] += 1
+                else:
+                    continue
+                
+                # Candidates exhausted: finish this test on the full pool
+                full_avail = np.ones(n_items, dtype=bool)
+                full_avail[cand[~avail]] = False
+                for _ in range(step, test_length):
+                    selected = self._select_item_sh(full_avail, theta, shp_arr)
+                    if selected is None:
+                        break
+                    full_avail[selected] = False
+                    exp_counts[selected] += 1
+    
+    @staticmethod
+    def _parse_dist(dist: str) -> Tuple[str, float, float]:
+        """Parse the ability distribution spec into (kind, param1, param2)."""
         if dist.startswith("normal"):
             # Parse normal(mean, std)
             params = dist.replace("normal", "").strip("()")
@@ -160,7 +476,7 @@ class SympsonHetterCalibrator:
                 mean, std = map(float, params.split(","))
             else:
                 mean, std = 0.0, 1.0
-            return np.random.normal(mean, std)
+            return "normal", mean, std
         
         elif dist.startswith("uniform"):
             # Parse uniform(min, max)
@@ -169,165 +485,187 @@ class SympsonHetterCalibrator:
                 min_val, max_val = map(float, params.split(","))
             else:
                 min_val, max_val = -3.0, 3.0
-            return np.random.uniform(min_val, max_val)
+            return "uniform", min_val, max_val
+        
+        else:
+            return "fixed", 0.0, 0.0
+    
+    def _sample_thetas(self, n: int) -> np.ndarray:
+        """Sample ``n`` abilities from the specified distribution."""
+        kind, p1, p2 = self._theta_dist
         
+        if kind == "normal":
+            return self._rng.normal(p1, p2, n)
+        elif kind == "uniform":
+            return self._rng.uniform(p1, p2, n)
         else:
-            return 0.0
+            return np.zeros(n)
     
     def _select_item_sh(
         self,
-        available: List[Dict[str, Any]],
-        theta: float
-    ) -> Optional[Dict[str, Any]]:
-        """Select item using Sympson-Hetter method."""
-        # Calculate information for each item
-        scored = []
-        for item in available:
-            info = self._fisher_info_3pl(
-                theta,
-                item.get("a", 1.0),
-                item.get("b", 0.0),
-                item.get("c", 0.2)
-            )
-            scored.append((info, item))
+        avail: np.ndarray,
+        theta: float,
+        shp_arr: np.ndarray
+    ) -> Optional[int]:
+        """Select item using Sympson-Hetter method.
+        
+        Returns the pool index of the selected item among those flagged in
+        the ``avail`` mask, or None if no item is available.
+        """
+        n_avail = np.count_nonzero(avail)
+        if n_avail == 0:
+            return None
         
-        # Sort by information (descending)
-        scored.sort(key=lambda x: x[0], reverse=True)
+        # Calculate information for every item at once
+        info = self._fisher_info_3pl_vec(theta)
+        masked_info = np.where(avail, info, -np.inf)
         
-        # Probabilistic selection
-        for _, item in scored:
-            sh_p = item.get("sh_p", 1.0)
-            if np.random.random() <= sh_p:
-                return item
+        # SH almost always accepts within the first few candidates: gate the
+        # top-K items in descending information order, first accept wins
+        k = min(SELECT_TOP_K, n_avail)
+        top = np.argpartition(-masked_info, k - 1)[:k]
+        order = top[np.argsort(-masked_info[top])]
+        accept = self._rng.random(k, dtype=np.float32) <= shp_arr[order]
+        i = int(np.argmax(accept))
+        if accept[i]:
+            return int(order[i])
+        
+        # None of them passed: gate every remaining item at once, and the
+        # most informative one that passes is where a descending scan stops
+        if k < n_avail:
+            rest = avail.copy()
+            rest[order] = False
+            passed = rest & (self._rng.random(len(info), dtype=np.float32) <= shp_arr)
+            idx = int(np.argmax(np.where(passed, info, -np.inf)))
+            if passed[idx]:
+                return idx
         
         # Fallback to highest information
-        return scored[0][1] if scored else None
+        return int(order[0])
+    
+    def _prepare_items(
+        self,
+        a_arr: np.ndarray,
+        b_arr: np.ndarray,
+        c_arr: np.ndarray
+    ) -> None:
+        """Precompute the theta-independent 3PL factors for the item pool.
+        
+        Factors are derived in float64 and stored as float32, which halves
+        the bytes streamed through the selection kernels; k-value updates
+        stay in float64.
+        """
+        Da = self.D * a_arr
+        self._Da = Da.astype(np.float32)
+        self._Dab = (Da * b_arr).astype(np.float32)
+        self._Da2 = (Da * Da).astype(np.float32)
+        self._c = c_arr.astype(np.float32)
+        self._one_minus_c = (1 - c_arr).astype(np.float32)
     
-    def _fisher_info_3pl(
+    def _fisher_info_3pl_vec(
         self,
         theta: float,
-        a: float,
-        b: float,
-        c: float
-    ) -> float:
-        """Calculate Fisher information for 3PL model."""
-        p = c + (1 - c) / (1 + np.exp(-self.D * a * (theta - b)))
-        q = 1 - p
-        
-        if p <= 0 or q <= 0 or (1 - c) <= 0:
-            return 0.0
-        
-        return (self.D ** 2) * (a ** 2) * (q / p) * ((p - c) / (1 - c)) ** 2
+        items: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Calculate Fisher information for 3PL model over the item pool.
+        
+        ``items`` restricts the computation to those pool positions.
+        
+        With ``sig`` the 2PL logistic, ``(p - c) / (1 - c)`` reduces to
+        ``sig`` itself, so no division by ``1 - c`` is needed; ``q > 0``
+        already rules out ``c >= 1``.
+        """
+        Da, Dab, Da2 = self._Da, self._Dab, self._Da2
+        c, one_minus_c = self._c, self._one_minus_c
+        if items is not None:
+            Da, Dab, Da2 = Da[items], Dab[items], Da2[items]
+            c, one_minus_c = c[items], one_minus_c[items]
+        
+        sig = expit(Da * theta - Dab)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            p = c + one_minus_c * sig
+            q = 1 - p
+            info = Da2 * (q / p) * (sig * sig)
+        
+        return np.where((p > 0) & (q > 0), info, 0.0)
     
     def _update_k_values(
         self,
-        pool: List[Dict[str, Any]],
-        k_map: Dict[Tuple[int, int], float],
-        rates: Dict[Tuple[int, int], float],
-        topic_tau: Dict[str, float]
-    ) -> Dict[Tuple[int, int], float]:
+        k_arr: np.ndarray,
+        rates: np.ndarray,
+        target_arr: np.ndarray
+    ) -> np.ndarray:
         """Update k values based on exposure rates."""
-        new_k_map = {}
-        
-        for item in pool:
-            key = (item["question_id"], item["version"])
-            current_k = k_map[key]
-            actual_rate = rates.get(key, 0.0)
-            
-            # Get target rate (topic-specific or global)
-            if topic_tau and item.get("topic_id"):
-                target_rate = topic_tau.get(str(item["topic_id"]), self.params.tau)
-            else:
-                target_rate = self.params.tau
-            
-            # Update k value
-            if actual_rate <= 0.0:
-                # Item not exposed, increase k slightly
-                new_k = min(self.params.ceiling, current_k * 1.1)
-            else:
-                # Adjust based on ratio
-                ratio = target_rate / actual_rate
-                new_k = current_k * (ratio ** self.params.alpha)
-                new_k = max(self.params.floor, min(self.params.ceiling, new_k))
-            
-            new_k_map[key] = new_k
-        
-        return new_k_map
+        # Adjust exposed items based on ratio; unexposed items increase slightly
+        ratio = target_arr / np.where(rates > 0.0, rates, 1.0)
+        adjusted = np.clip(
+            k_arr * ratio ** self.params.alpha,
+            self.params.floor,
+            self.params.ceiling
+        )
+        return np.where(
+            rates <= 0.0,
+            np.minimum(self.params.ceiling, k_arr * 1.1),
+            adjusted
+        )
     
-    def _calculate_statistics(
+    def _iteration_metrics(
         self,
-        rates: Dict[Tuple[int, int], float],
-        topic_tau: Dict[str, float],
-        pool: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """Calculate exposure statistics."""
-        rate_values = list(rates.values())
-        
-        # Overall statistics
+        rates: np.ndarray,
+        target_arr: np.ndarray,
+        old_k: np.ndarray,
+        new_k: np.ndarray
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Calculate exposure statistics and check convergence criteria."""
+        if rates.size == 0:
+            stats = dict.fromkeys(
+                ("mean_exposure", "max_exposure", "min_exposure",
+                 "std_exposure", "max_overexposure"),
+                0.0
+            )
+            stats = {"iteration": 0, **stats}
+            convergence = {"converged": True, **dict.fromkeys(
+                ("max_k_change", "mean_k_change",
+                 "max_rate_deviation", "mean_rate_deviation"),
+                0.0
+            )}
+            return stats, convergence
+        
+        # Overall statistics; the mean is shared with the std
+        mean_exposure = rates.mean()
+        centered = rates - mean_exposure
         stats = {
-            "iteration": len(rate_values),
-            "mean_exposure": np.mean(rate_values) if rate_values else 0.0,
-            "max_exposure": np.max(rate_values) if rate_values else 0.0,
-            "min_exposure": np.min(rate_values) if rate_values else 0.0,
-            "std_exposure": np.std(rate_values) if rate_values else 0.0,
+            "iteration": rates.size,
+            "mean_exposure": mean_exposure,
+            "max_exposure": rates.max(),
+            "min_exposure": rates.min(),
+            "std_exposure": np.sqrt(np.dot(centered, centered) / rates.size),
+            # Calculate overexposure
+            "max_overexposure": np.maximum(0, (rates - target_arr).max()),
         }
         
-        # Calculate overexposure
-        if topic_tau:
-            overexposures = []
-            for item in pool:
-                key = (item["question_id"], item["version"])
-                actual = rates.get(key, 0.0)
-                target = topic_tau.get(str(item.get("topic_id")), self.params.tau)
-                overexposures.append(max(0, actual - target))
-            stats["max_overexposure"] = np.max(overexposures) if overexposures else 0.0
-        else:
-            overexposures = [
-                max(0, rate - self.params.tau)
-                for rate in rate_values
-            ]
-            stats["max_overexposure"] = np.max(overexposures) if overexposures else 0.0
-        
-        return stats
-    
-    def _check_convergence(
-        self,
-        old_k: Dict[Tuple[int, int], float],
-        new_k: Dict[Tuple[int, int], float],
-        rates: Dict[Tuple[int, int], float]
-    ) -> Dict[str, Any]:
-        """Check convergence criteria."""
-        # Calculate k value changes
-        k_changes = [
-            abs(new_k[key] - old_k[key])
-            for key in old_k.keys()
-        ]
-        
-        # Calculate rate deviations from target
-        rate_deviations = [
-            abs(rate - self.params.tau)
-            for rate in rates.values()
-        ]
+        # Calculate k value changes and rate deviations from target
+        k_changes = np.abs(new_k - old_k)
+        rate_deviations = np.abs(rates - self.params.tau)
+        max_k_change = k_changes.max()
+        max_rate_deviation = rate_deviations.max()
         
         # Convergence criteria
-        max_k_change = np.max(k_changes) if k_changes else 0.0
-        mean_k_change = np.mean(k_changes) if k_changes else 0.0
-        max_rate_deviation = np.max(rate_deviations) if rate_deviations else 0.0
-        
         converged = (
             max_k_change < 0.01 and
             max_rate_deviation < 0.05
         )
         
-        return {
+        convergence = {
             "converged": converged,
             "max_k_change": max_k_change,
-            "mean_k_change": mean_k_change,
+            "mean_k_change": k_changes.mean(),
             "max_rate_deviation": max_rate_deviation,
-            "mean_rate_deviation": np.mean(rate_deviations) if rate_deviations else 0.0
+            "mean_rate_deviation": rate_deviations.mean()
         }
+        return stats, convergence
 
-def load_pool_from_db(conn: psycopg2.extensions.connection, exam_code: str) -> List[Dict[str, Any]]:
+def load_pool_from_db(conn: psycopg2.extensions.connection, exam_code: str) -> ItemPool:
     """Load item pool from database."""
     sql = """
         SELECT 
@@ -353,22 +691,23 @@ def load_pool_from_db(conn: psycopg2.extensions.connection, exam_code: str) -> L
             AND qv.state = 'published'
     """
     
-    with conn.cursor(psycopg2.extras.DictCursor) as cur:
+    # Plain tuple rows, read by position in SELECT order
+    with conn.cursor() as cur:
         cur.execute(sql, (exam_code,))
         rows = cur.fetchall()
     
-    return [
-        {
-            "question_id": int(row["question_id"]),
-            "version": int(row["version"]),
-            "topic_id": row["topic_id"],
-            "a": float(row["a"]),
-            "b": float(row["b"]),
-            "c": float(row["c"]),
-            "sh_p": float(row["sh_p"])
-        }
-        for row in rows
-    ]
+    n = len(rows)
+    topic_key = np.empty(n, dtype=object)
+    topic_key[:] = [_topic_key(row[2]) for row in rows]
+    return ItemPool(
+        question_id=np.fromiter((row[0] for row in rows), dtype=np.int64, count=n),
+        version=np.fromiter((row[1] for row in rows), dtype=np.int64, count=n),
+        topic_key=topic_key,
+        a=np.fromiter((row[3] for row in rows), dtype=float, count=n),
+        b=np.fromiter((row[4] for row in rows), dtype=float, count=n),
+        c=np.fromiter((row[5] for row in rows), dtype=float, count=n),
+        sh_p=np.fromiter((row[6] for row in rows), dtype=float, count=n)
+    )
 
 def save_k_values_to_db(
     conn: psycopg2.extensions.connection,
@@ -378,18 +717,20 @@ def save_k_values_to_db(
     with conn.cursor() as cur:
         cur.execute("SET search_path TO public")
         
-        for (qid, ver), k_value in k_map.items():
-            cur.execute(
-                """
-                INSERT INTO item_exposure_control (question_id, version, sh_p)
-                VALUES (%s, %s, %s)
-                ON CONFLICT (question_id, version)
-                DO UPDATE SET 
-                    sh_p = EXCLUDED.sh_p,
-                    updated_at = now()
-                """,
-                (qid, ver, float(k_value))
-            )
+        rows = [(qid, ver, float(k_value)) for (qid, ver), k_value in k_map.items()]
+        execute_values(
+            cur,
+            """
+            INSERT INTO item_exposure_control (question_id, version, sh_p)
+            VALUES %s
+            ON CONFLICT (question_id, version)
+            DO UPDATE SET 
+                sh_p = EXCLUDED.sh_p,
+                updated_at = now()
+            """,
+            rows,
+            page_size=1000
+        )
     
     conn.commit()
     return len(k_map)
\ No newline at end of file
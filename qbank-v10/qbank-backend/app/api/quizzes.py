@@ -1,27 +1,100 @@
 # QBank v10 - Quiz API Endpoints
 from fastapi import APIRouter, Depends, HTTPException, Query, Body
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from sqlalchemy import select, insert, func, and_, or_, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
+import asyncio
 import uuid
 import random
 import numpy as np
+import orjson
 
-from app.core.database import get_db
+from app.core.database import get_db, driver_connection, AsyncSessionLocal
 from app.core.cache import cache
 from app.models.orm import (
     QuizSession, QuizItem, UserResponse, Question, QuestionVersion,
-    QuestionOption, ItemCalibration, UserAbility, Topic
+    QuestionOption, ItemCalibration, UserAbility, Topic,
+    QuestionState, DifficultyLevel
 )
 from app.services.adaptive import AdaptiveSelector, IRTEngine
 from app.services.calibration import CalibrationEngine
 
 router = APIRouter(prefix="/v1/quizzes", tags=["quizzes"])
 
+# Hot-path SQL, run on the session's asyncpg connection. The text never
+# changes, so each pooled connection prepares it once and reuses the plan.
+# Enum columns hold member names ("PUBLISHED", "MEDIUM").
+PS_AVAILABLE_Q = """
+SELECT qv.id, qv.question_id, qv.version, qv.topic_id,
+       qv.difficulty_label::text AS difficulty_label, ic.a, ic.b, ic.c
+FROM question_versions qv
+JOIN questions q ON q.id = qv.question_id
+LEFT JOIN item_calibration ic
+       ON ic.question_id = qv.question_id
+      AND ic.version = qv.version
+      AND ic.model = '3PL'
+WHERE qv.state = $1
+  AND q.is_deleted = false
+"""
+
+PS_TOPIC_IDS = """
+SELECT name, array_agg(id) AS ids FROM topics GROUP BY name
+"""
+
+# json values are decoded by the codec the engine installs on each connection
+PS_QUESTION_FOR_QV = """
+SELECT qv.stem_md, qv.lead_in,
+       (SELECT json_agg(json_build_object('label', o.option_label,
+                                          'text', o.option_text_md)
+                        ORDER BY o.option_label)
+        FROM question_options o
+        WHERE o.question_version_id = qv.id) AS options
+FROM question_versions qv
+WHERE qv.id = $1
+"""
+
+# Default 3PL parameters for uncalibrated items, indexed by difficulty code
+DEFAULT_DIFFICULTY_PARAMS = {
+    DifficultyLevel.VERY_EASY: (1.0, -2.0, 0.1),
+    DifficultyLevel.EASY: (1.0, -1.0, 0.15),
+    DifficultyLevel.MEDIUM: (1.0, 0.0, 0.2),
+    DifficultyLevel.HARD: (1.0, 1.0, 0.2),
+    DifficultyLevel.VERY_HARD: (1.0, 2.0, 0.25),
+}
+_DIFFICULTY_CODES = {
+    level.name: code for code, level in enumerate(DEFAULT_DIFFICULTY_PARAMS)
+}
+_MEDIUM_CODE = _DIFFICULTY_CODES[DifficultyLevel.MEDIUM.name]
+# Quiz configs name difficulties by value ("medium")
+_DIFFICULTY_VALUE_CODES = {
+    level.value: _DIFFICULTY_CODES[level.name] for level in DifficultyLevel
+}
+# Rows of (a, b, c) in difficulty code order, gathered with one fancy index
+DEFAULT_ABC = np.ascontiguousarray(
+    list(DEFAULT_DIFFICULTY_PARAMS.values()), dtype=np.float32
+)
+
+# Candidates sent per exposure check; one window normally fills the shortlist
+EXPOSURE_WINDOW = 32
+
+# Packed layout of a cached item bank, one record per published version.
+# topic_id and difficulty are -1 where the version has none.
+ITEM_BANK_DTYPE = np.dtype([
+    ("qv_id", np.int64),
+    ("question_id", np.int64),
+    ("version", np.int32),
+    ("topic_id", np.int64),
+    ("difficulty", np.int8),
+    ("a", np.float32),
+    ("b", np.float32),
+    ("c", np.float32),
+])
+
 # Initialize engines
-irt_engine = IRTEngine(model="3PL")
-adaptive_selector = AdaptiveSelector(irt_engine)
+irt_engine = IRTEngine()
+adaptive_selector = AdaptiveSelector()
 calibration_engine = CalibrationEngine()
 
 @router.post("/", response_model=Dict[str, Any])
@@ -39,11 +112,9 @@ async def create_quiz(
     """Create a new quiz session"""
     
     # Create quiz session
-    quiz_id = uuid.uuid4()
-    expires_at = datetime.utcnow() + timedelta(seconds=time_limit)
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=time_limit)
     
     session = QuizSession(
-        id=quiz_id,
         user_id=user_id,
         tenant_id=uuid.UUID("00000000-0000-0000-0000-000000000001"),
         mode=mode,
@@ -55,11 +126,14 @@ async def create_quiz(
             "difficulty": difficulty,
             "time_limit": time_limit
         },
-        started_at=datetime.utcnow(),
+        started_at=datetime.now(timezone.utc),
         expires_at=expires_at
     )
     
+    # The id is generated by the database and returned by the insert
     db.add(session)
+    await db.flush()
+    quiz_id = session.id
     
     # Get initial questions
     if adaptive:
@@ -84,7 +158,7 @@ async def create_quiz(
                 question_id=first_question["id"],
                 version=first_question["version"],
                 position=1,
-                served_at=datetime.utcnow()
+                served_at=datetime.now(timezone.utc)
             )
             db.add(quiz_item)
     else:
@@ -93,15 +167,19 @@ async def create_quiz(
             db, num_questions, topics, difficulty, exam_code
         )
         
-        for i, q in enumerate(questions[:num_questions], 1):
-            quiz_item = QuizItem(
-                quiz_id=quiz_id,
-                question_id=q["id"],
-                version=q["version"],
-                position=i,
-                served_at=datetime.utcnow()
-            )
-            db.add(quiz_item)
+        # Binary COPY on the session's connection, inside the same transaction
+        # that already holds the session row the items reference
+        served_at = datetime.now(timezone.utc)
+        conn = await driver_connection(db)
+        await conn.copy_records_to_table(
+            "quiz_items",
+            records=[
+                (quiz_id, q["id"], q["version"], i, served_at, "{}")
+                for i, q in enumerate(questions[:num_questions], 1)
+            ],
+            columns=["quiz_id", "question_id", "version", "position",
+                     "served_at", "metadata"]
+        )
     
     await db.commit()
     
@@ -112,7 +190,8 @@ async def create_quiz(
         "adaptive": adaptive,
         "theta": 0.0,
         "se": 1.0,
-        "responses": []
+        "answered_ids": [],
+        "position": 0
     })
     
     return {
@@ -131,10 +210,41 @@ async def get_next_question(
 ):
     """Get the next question in the quiz"""
     
-    # Get quiz session
-    query = select(QuizSession).where(QuizSession.id == uuid.UUID(quiz_id))
-    result = await db.execute(query)
-    session = result.scalar_one_or_none()
+    quiz_uuid = uuid.UUID(quiz_id)
+    cached_session = await cache.get_session(quiz_id)
+    
+    if cached_session and "answered_ids" in cached_session:
+        # Answered questions are tracked in the cached session
+        query = select(QuizSession).where(QuizSession.id == quiz_uuid)
+        result = await db.execute(query)
+        session = result.scalar_one_or_none()
+        answered_ids = cached_session["answered_ids"]
+        position = cached_session["position"]
+        score = None
+    else:
+        # Session, answered questions and running score in one round-trip
+        answered = select(
+            UserResponse.quiz_id,
+            func.array_agg(UserResponse.question_id).label("question_ids"),
+            func.count(UserResponse.id).label("total"),
+            func.sum(UserResponse.is_correct_int).label("correct")
+        ).where(
+            UserResponse.quiz_id == quiz_uuid
+        ).group_by(UserResponse.quiz_id).cte("answered")
+        
+        query = select(
+            QuizSession,
+            answered.c.question_ids,
+            answered.c.total,
+            answered.c.correct
+        ).outerjoin(
+            answered, answered.c.quiz_id == QuizSession.id
+        ).where(QuizSession.id == quiz_uuid)
+        result = await db.execute(query)
+        session, answered_ids, total, correct = result.first() or (None, None, 0, 0)
+        answered_ids = answered_ids or []
+        position = len(answered_ids)
+        score = (total or 0, correct or 0)
     
     if not session:
         raise HTTPException(status_code=404, detail="Quiz not found")
@@ -142,20 +252,12 @@ async def get_next_question(
     if session.completed_at:
         raise HTTPException(status_code=400, detail="Quiz already completed")
     
-    if datetime.utcnow() > session.expires_at:
+    if datetime.now(timezone.utc) > session.expires_at:
         raise HTTPException(status_code=400, detail="Quiz expired")
     
-    # Get answered questions
-    answered_query = select(UserResponse.question_id).where(
-        UserResponse.quiz_id == uuid.UUID(quiz_id)
-    )
-    answered_result = await db.execute(answered_query)
-    answered_ids = [r[0] for r in answered_result.fetchall()]
-    
     # Get next question
     if session.adaptive:
         # Get current theta from cache
-        cached_session = await cache.get_session(quiz_id)
         theta = cached_session.get("theta", 0.0) if cached_session else 0.0
         
         # Select next adaptive question
@@ -169,77 +271,81 @@ async def get_next_question(
         
         if next_q:
             # Add to quiz items
-            position = len(answered_ids) + 1
             quiz_item = QuizItem(
-                quiz_id=uuid.UUID(quiz_id),
+                quiz_id=quiz_uuid,
                 question_id=next_q["id"],
                 version=next_q["version"],
-                position=position,
-                served_at=datetime.utcnow()
+                position=position + 1,
+                served_at=datetime.now(timezone.utc)
             )
             db.add(quiz_item)
             await db.commit()
     else:
-        # Get pre-selected question
-        items_query = select(QuizItem).where(
-            QuizItem.quiz_id == uuid.UUID(quiz_id),
-            ~QuizItem.question_id.in_(answered_ids) if answered_ids else True
-        ).order_by(QuizItem.position)
-        items_result = await db.execute(items_query)
-        next_item = items_result.scalars().first()
+        # Pre-selected item, its question version and options in one row
+        answered_cte = select(UserResponse.question_id).where(
+            UserResponse.quiz_id == quiz_uuid
+        ).cte("answered_ids")
+        
+        options = select(
+            func.json_agg(aggregate_order_by(
+                func.json_build_object(
+                    "label", QuestionOption.option_label,
+                    "text", QuestionOption.option_text_md
+                ),
+                QuestionOption.option_label
+            ))
+        ).where(
+            QuestionOption.question_version_id == QuestionVersion.id
+        ).correlate(QuestionVersion).scalar_subquery()
         
-        if next_item:
-            # Get question details
-            q_query = select(QuestionVersion, Question).join(
-                Question, Question.id == QuestionVersion.question_id
-            ).where(
-                QuestionVersion.question_id == next_item.question_id,
-                QuestionVersion.version == next_item.version
+        items_query = select(
+            QuizItem.position,
+            Question.id,
+            QuestionVersion.version,
+            QuestionVersion.stem_md,
+            QuestionVersion.lead_in,
+            options.label("options")
+        ).join(
+            QuestionVersion,
+            and_(
+                QuestionVersion.question_id == QuizItem.question_id,
+                QuestionVersion.version == QuizItem.version
             )
-            q_result = await db.execute(q_query)
-            q_data = q_result.first()
-            
-            if q_data:
-                qv, q = q_data
-                
-                # Get options
-                opt_query = select(QuestionOption).where(
-                    QuestionOption.question_version_id == qv.id
-                )
-                opt_result = await db.execute(opt_query)
-                options = opt_result.scalars().all()
-                
-                next_q = {
-                    "id": q.id,
-                    "version": qv.version,
-                    "stem": qv.stem_md,
-                    "lead_in": qv.lead_in,
-                    "options": [
-                        {
-                            "label": opt.option_label,
-                            "text": opt.option_text_md
-                        }
-                        for opt in options
-                    ],
-                    "position": next_item.position,
-                    "total": session.config.get("num_questions", 30)
-                }
-            else:
-                next_q = None
+        ).join(
+            Question, Question.id == QuestionVersion.question_id
+        ).where(
+            QuizItem.quiz_id == quiz_uuid,
+            QuizItem.question_id.not_in(select(answered_cte.c.question_id))
+        ).order_by(QuizItem.position).limit(1)
+        items_result = await db.execute(items_query)
+        item = items_result.first()
+        
+        if item:
+            next_q = {
+                "id": item.id,
+                "version": item.version,
+                "stem": item.stem_md,
+                "lead_in": item.lead_in,
+                "options": item.options or [],
+                "position": item.position,
+                "total": session.config.get("num_questions", 30)
+            }
         else:
             next_q = None
     
     if not next_q:
         # No more questions, complete the quiz
-        session.completed_at = datetime.utcnow()
+        session.completed_at = datetime.now(timezone.utc)
         
         # Calculate score
-        score_query = select(
-            func.count(UserResponse.id),
-            func.sum(func.cast(UserResponse.is_correct, int))
-        ).where(UserResponse.quiz_id == uuid.UUID(quiz_id))
-        score_result = await db.execute(score_query)
-        total, correct = score_result.first()
+        if score is None:
+            score_query = select(
+                func.count(),
+                func.sum(UserResponse.is_correct_int)
+            ).where(UserResponse.quiz_id == quiz_uuid)
+            score_result = await db.execute(score_query)
+            score = score_result.first()
+        total, correct = score[0] or 0, score[1] or 0
         
         session.score = (correct / total * 100) if total > 0 else 0
         await db.commit()
@@ -264,114 +370,116 @@ async def submit_answer(
 ):
     """Submit an answer for a question"""
     
-    # Get quiz session
-    query = select(QuizSession).where(QuizSession.id == uuid.UUID(quiz_id))
+    # Get quiz session and the version of the question it served
+    quiz_uuid = uuid.UUID(quiz_id)
+    query = select(QuizSession, QuizItem.version).outerjoin(
+        QuizItem, and_(
+            QuizItem.quiz_id == QuizSession.id,
+            QuizItem.question_id == question_id
+        )
+    ).where(QuizSession.id == quiz_uuid).order_by(QuizItem.position.desc()).limit(1)
     result = await db.execute(query)
-    session = result.scalar_one_or_none()
+    row = result.first()
     
-    if not session:
+    if not row:
         raise HTTPException(status_code=404, detail="Quiz not found")
+    session, version = row
+    if version is None:
+        raise HTTPException(status_code=404, detail="Question not found")
     
-    # Get question and correct answer
-    q_query = select(QuestionVersion, QuestionOption).join(
-        QuestionOption, QuestionOption.question_version_id == QuestionVersion.id
-    ).where(
-        QuestionVersion.question_id == question_id,
-        QuestionOption.is_correct == True
+    # Answer key from cache, read while the cached session is fetched
+    answer, (cached_session, loglik) = await asyncio.gather(
+        load_answer_key(db, question_id, version), load_session(quiz_id)
     )
-    q_result = await db.execute(q_query)
-    q_data = q_result.first()
     
-    if not q_data:
+    if not answer:
         raise HTTPException(status_code=404, detail="Question not found")
     
-    qv, correct_option = q_data
-    is_correct = selected == correct_option.option_label
+    is_correct = selected == answer["label"]
+    calibration = None
+    if session.adaptive and cached_session:
+        cal_query = select(ItemCalibration).where(
+            ItemCalibration.question_id == question_id,
+            ItemCalibration.version == version,
+            ItemCalibration.model == "3PL"
+        )
+        calibration = (await db.execute(cal_query)).scalars().first()
+    now = datetime.now(timezone.utc)
     
     # Save response
-    response = UserResponse(
-        quiz_id=uuid.UUID(quiz_id),
+    write = insert(UserResponse).values(
+        quiz_id=quiz_uuid,
         user_id=session.user_id,
         question_id=question_id,
-        version=qv.version,
+        version=version,
         option_label=selected,
         is_correct=is_correct,
         time_taken_ms=time_taken_ms,
         confidence=confidence,
-        created_at=datetime.utcnow()
+        created_at=now
     )
-    db.add(response)
+    theta_updated = False
     
     # Update theta if adaptive
-    if session.adaptive:
-        # Get item parameters
-        cal_query = select(ItemCalibration).where(
-            ItemCalibration.question_id == question_id,
-            ItemCalibration.version == qv.version,
-            ItemCalibration.model == "3PL"
-        )
-        cal_result = await db.execute(cal_query)
-        calibration = cal_result.scalar_one_or_none()
+    if session.adaptive and calibration and cached_session:
+        y = 1.0 if is_correct else 0.0
+        a, b, c = calibration.a or 1.0, calibration.b or 0.0, calibration.c or 0.0
+        
+        # Update theta using IRT; the grid log-likelihood carries all
+        # earlier responses, so each answer costs one item's worth of work
+        loglik = loglik + irt_engine.eap_loglik(y, a, b, c)
+        new_theta, new_se = irt_engine.eap_from_loglik(loglik)
+        history = cached_session.setdefault("theta_history", [])
+        history.append(irt_engine.progression_step(
+            history[-1] if history else 0.0, y, a, b, c
+        ))
+        cached_session.update(theta=new_theta, se=new_se)
+        theta_updated = True
         
-        if calibration:
-            # Get current theta
-            cached_session = await cache.get_session(quiz_id)
-            if cached_session:
-                theta = cached_session.get("theta", 0.0)
-                responses = cached_session.get("responses", [])
-                
-                # Update theta using IRT
-                new_theta, new_se = irt_engine.estimate_theta_eap(
-                    responses + [{
-                        "correct": is_correct,
-                        "a": calibration.a or 1.0,
-                        "b": calibration.b or 0.0,
-                        "c": calibration.c or 0.0
-                    }]
-                )
-                
-                # Update cache
-                cached_session["theta"] = new_theta
-                cached_session["se"] = new_se
-                cached_session["responses"].append({
-                    "correct": is_correct,
-                    "a": calibration.a or 1.0,
-                    "b": calibration.b or 0.0,
-                    "c": calibration.c or 0.0
-                })
-                await cache.set_session(quiz_id, cached_session)
-                
-                # Update user ability
-                ability_query = select(UserAbility).where(
-                    UserAbility.user_id == session.user_id,
-                    UserAbility.topic_id == qv.topic_id
-                )
-                ability_result = await db.execute(ability_query)
-                ability = ability_result.scalar_one_or_none()
-                
-                if ability:
-                    ability.theta = new_theta
-                    ability.theta_se = new_se
-                    ability.n_responses += 1
-                    ability.updated_at = datetime.utcnow()
-                else:
-                    ability = UserAbility(
-                        user_id=session.user_id,
-                        topic_id=qv.topic_id,
-                        theta=new_theta,
-                        theta_se=new_se,
-                        n_responses=1,
-                        updated_at=datetime.utcnow()
-                    )
-                    db.add(ability)
+        # Insert the response and upsert the user ability in one statement;
+        # the unique index maps a NULL (global) topic_id to -1 so concurrent
+        # first answers conflict instead of adding a second row
+        inserted = write.returning(UserResponse.id).cte("inserted")
+        write = pg_insert(UserAbility).values(
+            user_id=session.user_id,
+            topic_id=answer["topic_id"],
+            theta=new_theta,
+            theta_se=new_se,
+            n_responses=1,
+            updated_at=now
+        )
+        write = write.on_conflict_do_update(
+            index_elements=[
+                UserAbility.user_id,
+                # Inline -1: a bound parameter would not infer the index
+                func.coalesce(UserAbility.topic_id, literal_column("-1"))
+            ],
+            set_={
+                "theta": write.excluded.theta,
+                "theta_se": write.excluded.theta_se,
+                "n_responses": UserAbility.n_responses + 1,
+                "updated_at": write.excluded.updated_at
+            }
+        ).add_cte(inserted)
     
+    await db.execute(write)
     await db.commit()
     
+    # Update cache once the response is persisted
+    if cached_session:
+        if "answered_ids" in cached_session:
+            cached_session["answered_ids"].append(question_id)
+            cached_session["position"] += 1
+        writes = [cache.set_session(quiz_id, cached_session)]
+        if theta_updated:
+            writes.append(cache.set_session_loglik(quiz_id, loglik))
+        await asyncio.gather(*writes)
+    
     return {
         "correct": is_correct,
-        "correct_answer": correct_option.option_label,
-        "explanation": correct_option.explanation_md,
-        "rationale": qv.rationale_md
+        "correct_answer": answer["label"],
+        "explanation": answer["explanation"],
+        "rationale": answer["rationale"]
     }
 
 @router.get("/{quiz_id}/results", response_model=Dict[str, Any])
@@ -389,54 +497,55 @@ async def get_quiz_results(
     if not session:
         raise HTTPException(status_code=404, detail="Quiz not found")
     
-    # Get all responses
-    resp_query = select(UserResponse).where(
-        UserResponse.quiz_id == uuid.UUID(quiz_id)
-    ).order_by(UserResponse.created_at)
-    resp_result = await db.execute(resp_query)
-    responses = resp_result.scalars().all()
+    # Count, score and time in one pass over the covering quiz index
+    stats_query = select(
+        func.count(),
+        func.sum(UserResponse.is_correct_int),
+        func.sum(UserResponse.time_taken_ms)
+    ).where(UserResponse.quiz_id == uuid.UUID(quiz_id))
+    stats = (await db.execute(stats_query)).first()
     
     # Calculate statistics
-    total = len(responses)
-    correct = sum(1 for r in responses if r.is_correct)
+    total = stats[0] or 0
+    correct = stats[1] or 0
     score = (correct / total * 100) if total > 0 else 0
     
     # Calculate time statistics
-    total_time = sum(r.time_taken_ms or 0 for r in responses)
+    total_time = stats[2] or 0
     avg_time = total_time / total if total > 0 else 0
     
     # Get theta progression if adaptive
     theta_progression = []
     if session.adaptive:
-        cached_session = await cache.get_session(quiz_id)
+        cached_session, _ = await load_session(quiz_id)
         if cached_session:
-            theta_progression = calculate_theta_progression(
-                cached_session.get("responses", [])
-            )
+            theta_progression = cached_session.get("theta_history", [])
+    
+    # Topic-wise performance, aggregated in one grouped query
+    topic_query = select(
+        Topic.name,
+        func.count(UserResponse.id),
+        func.sum(UserResponse.is_correct_int)
+    ).select_from(UserResponse).join(
+        QuestionVersion,
+        and_(
+            QuestionVersion.question_id == UserResponse.question_id,
+            QuestionVersion.version == UserResponse.version
+        )
+    ).outerjoin(
+        Topic, Topic.id == QuestionVersion.topic_id
+    ).where(
+        UserResponse.quiz_id == uuid.UUID(quiz_id)
+    ).group_by(Topic.name)
+    topic_result = await db.execute(topic_query)
     
-    # Topic-wise performance
     topic_performance = {}
-    for response in responses:
-        # Get question topic
-        qv_query = select(QuestionVersion, Topic).join(
-            Topic, Topic.id == QuestionVersion.topic_id
-        ).where(
-            QuestionVersion.question_id == response.question_id,
-            QuestionVersion.version == response.version
+    for topic_name, topic_total, topic_correct in topic_result.all():
+        bucket = topic_performance.setdefault(
+            topic_name or "General", {"correct": 0, "total": 0}
         )
-        qv_result = await db.execute(qv_query)
-        qv_data = qv_result.first()
-        
-        if qv_data:
-            qv, topic = qv_data
-            topic_name = topic.name if topic else "General"
-            
-            if topic_name not in topic_performance:
-                topic_performance[topic_name] = {"correct": 0, "total": 0}
-            
-            topic_performance[topic_name]["total"] += 1
-            if response.is_correct:
-                topic_performance[topic_name]["correct"] += 1
+        bucket["total"] += topic_total
+        bucket["correct"] += topic_correct or 0
     
     return {
         "quiz_id": quiz_id,
@@ -466,115 +575,66 @@ async def select_adaptive_question(
 ) -> Optional[Dict[str, Any]]:
     """Select next question using adaptive algorithm"""
     
-    # Build query for available questions
-    query = select(
-        QuestionVersion,
-        Question,
-        ItemCalibration
-    ).join(
-        Question, Question.id == QuestionVersion.question_id
-    ).outerjoin(
-        ItemCalibration, and_(
-            ItemCalibration.question_id == QuestionVersion.question_id,
-            ItemCalibration.version == QuestionVersion.version,
-            ItemCalibration.model == "3PL"
-        )
-    ).where(
-        QuestionVersion.state == "published",
-        Question.is_deleted == False
-    )
-    
-    # Apply filters
-    if answered_ids:
-        query = query.where(~Question.id.in_(answered_ids))
+    bank = await load_item_bank(db, exam_code)
+    cands = bank.candidates(topics, difficulty)
+    if answered_ids and len(cands):
+        cands = cands[~np.isin(bank.items["question_id"][cands], answered_ids)]
+    bank = bank.items[cands]
     
-    if topics:
-        topic_query = select(Topic.id).where(Topic.name.in_(topics))
-        topic_result = await db.execute(topic_query)
-        topic_ids = [t[0] for t in topic_result.fetchall()]
-        if topic_ids:
-            query = query.where(QuestionVersion.topic_id.in_(topic_ids))
-    
-    if difficulty:
-        query = query.where(QuestionVersion.difficulty_label.in_(difficulty))
-    
-    # Execute query
-    result = await db.execute(query)
-    available = result.all()
-    
-    if not available:
+    if not len(bank):
         return None
     
-    # Calculate information for each question
+    # Fisher information at current theta for every candidate at once
+    info = irt_engine.fisher_info_3pl_vec(theta, bank["a"], bank["b"], bank["c"])
+    
+    # Walk candidates by information, checking exposure a window at a time
+    # until the top candidates are filled
+    top_n = min(5, len(bank))
+    order = np.argsort(-info, kind="stable")
     questions_with_info = []
-    for qv, q, cal in available:
-        if cal and cal.a and cal.b:
-            # Use calibrated parameters
-            a, b, c = cal.a, cal.b, cal.c or 0.0
-        else:
-            # Use default parameters based on difficulty
-            difficulty_params = {
-                "very_easy": {"a": 1.0, "b": -2.0, "c": 0.1},
-                "easy": {"a": 1.0, "b": -1.0, "c": 0.15},
-                "medium": {"a": 1.0, "b": 0.0, "c": 0.2},
-                "hard": {"a": 1.0, "b": 1.0, "c": 0.2},
-                "very_hard": {"a": 1.0, "b": 2.0, "c": 0.25}
-            }
-            params = difficulty_params.get(
-                qv.difficulty_label or "medium",
-                difficulty_params["medium"]
-            )
-            a, b, c = params["a"], params["b"], params["c"]
-        
-        # Calculate Fisher information at current theta
-        info = irt_engine.information_3pl(theta, a, b, c)
-        
-        # Apply exposure control
-        can_serve = await cache.can_serve(q.id, qv.version)
-        if can_serve:
+    for start in range(0, len(order), EXPOSURE_WINDOW):
+        window = bank[order[start:start + EXPOSURE_WINDOW]]
+        keys = cache.exposure_keys(
+            zip(window["question_id"].tolist(), window["version"].tolist())
+        )
+        for pos in await cache.filter_serveable(keys, top_n - len(questions_with_info)):
+            item = window[pos]
             questions_with_info.append({
-                "id": q.id,
-                "version": qv.version,
-                "info": info,
-                "a": a,
-                "b": b,
-                "c": c,
-                "qv": qv,
-                "q": q
+                "id": int(item["question_id"]),
+                "version": int(item["version"]),
+                "qv_id": int(item["qv_id"]),
+                "info": float(info[order[start + pos]]),
+                "a": float(item["a"]),
+                "b": float(item["b"]),
+                "c": float(item["c"])
             })
+        if len(questions_with_info) == top_n:
+            break
     
     if not questions_with_info:
         return None
     
-    # Sort by information and select from top candidates
-    questions_with_info.sort(key=lambda x: x["info"], reverse=True)
-    
-    # Add randomization to avoid always selecting same questions
-    top_n = min(5, len(questions_with_info))
-    selected = random.choice(questions_with_info[:top_n])
-    
-    # Update exposure count
-    await cache.bump_exposure(selected["id"], selected["version"])
+    # Add randomization to avoid always selecting same questions; a candidate
+    # that reached its cap since the check is skipped for the next one
+    random.shuffle(questions_with_info)
+    for selected in questions_with_info:
+        if await cache.try_reserve(selected["id"], selected["version"]):
+            break
+    else:
+        return None
     
-    # Get options
-    opt_query = select(QuestionOption).where(
-        QuestionOption.question_version_id == selected["qv"].id
-    ).order_by(QuestionOption.option_label)
-    opt_result = await db.execute(opt_query)
-    options = opt_result.scalars().all()
+    # Stem and options of the selected version only
+    conn = await driver_connection(db)
+    row = await conn.fetchrow(PS_QUESTION_FOR_QV, selected["qv_id"])
+    if not row:
+        return None
     
     return {
         "id": selected["id"],
         "version": selected["version"],
-        "stem": selected["qv"].stem_md,
-        "lead_in": selected["qv"].lead_in,
-        "options": [
-            {
-                "label": opt.option_label,
-                "text": opt.option_text_md
-            }
-            for opt in options
-        ],
+        "stem": row["stem_md"],
+        "lead_in": row["lead_in"],
+        "options": row["options"] or [],
         "parameters": {
             "a": selected["a"],
             "b": selected["b"],
@@ -582,6 +642,121 @@ async def select_adaptive_question(
         }
     }
 
+class ItemBank:
+    """Published item bank with row indices binned by (topic_id, difficulty)."""
+    
+    def __init__(self, items: np.ndarray, topic_ids: Dict[str, List[int]]):
+        self.items = items
+        self.topic_ids = topic_ids
+        
+        # One stable sort groups the rows of each bin together
+        bins = items["topic_id"] * (len(_DIFFICULTY_CODES) + 1) + items["difficulty"] + 1
+        order = np.argsort(bins, kind="stable").astype(np.int32)
+        _, starts = np.unique(bins[order], return_index=True)
+        self.bins = {
+            (int(items["topic_id"][rows[0]]), int(items["difficulty"][rows[0]])): rows
+            for rows in np.split(order, starts[1:])
+        } if len(items) else {}
+        self.topic_set = {t for t, _ in self.bins}
+        self.diff_set = {d for _, d in self.bins}
+    
+    def candidates(
+        self,
+        topics: Optional[List[str]],
+        difficulty: Optional[List[str]]
+    ) -> np.ndarray:
+        """Row indices matching a quiz configuration.
+        
+        Topic names that match no topic leave the bank unfiltered by topic;
+        unknown difficulty values match nothing.
+        """
+        topic_ids = [
+            tid for name in topics or [] for tid in self.topic_ids.get(name, ())
+        ]
+        if not topic_ids:
+            if not difficulty:
+                return np.arange(len(self.items), dtype=np.int32)
+            topic_ids = self.topic_set
+        diffs = (
+            {_DIFFICULTY_VALUE_CODES[d] for d in difficulty if d in _DIFFICULTY_VALUE_CODES}
+            if difficulty else self.diff_set
+        )
+        rows = [
+            self.bins[key] for key in ((t, d) for t in topic_ids for d in diffs)
+            if key in self.bins
+        ]
+        if not rows:
+            return np.empty(0, dtype=np.int32)
+        return np.sort(np.concatenate(rows))
+    
+    def to_bytes(self) -> bytes:
+        header = orjson.dumps(self.topic_ids)
+        return len(header).to_bytes(4, "little") + header + self.items.tobytes()
+    
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "ItemBank":
+        size = int.from_bytes(blob[:4], "little")
+        return cls(
+            np.frombuffer(blob, dtype=ITEM_BANK_DTYPE, offset=4 + size),
+            orjson.loads(blob[4:4 + size])
+        )
+
+# Binned banks decoded in this process, reused while the cached blob is unchanged
+_item_banks: Dict[str, Tuple[bytes, ItemBank]] = {}
+
+async def load_item_bank(
+    db: AsyncSession,
+    exam_code: Optional[str]
+) -> ItemBank:
+    """Published item bank as a packed record array with its bin index.
+    
+    Banks are cached in Redis for ITEM_BANK_TTL seconds, so item parameters
+    reach adaptive selection at most that long after recalibration.
+    """
+    key = cache.item_bank_key(exam_code)
+    blob = await cache.get_item_bank(key)
+    if blob is not None:
+        loaded = _item_banks.get(key)
+        if loaded is not None and loaded[0] == blob:
+            return loaded[1]
+        bank = ItemBank.from_bytes(blob)
+        _item_banks[key] = (blob, bank)
+        return bank
+    
+    # Fixed SQL text so asyncpg reuses the connection's prepared plan
+    conn = await driver_connection(db)
+    available = await conn.fetch(PS_AVAILABLE_Q, QuestionState.PUBLISHED.name)
+    topic_rows = await conn.fetch(PS_TOPIC_IDS)
+    
+    # Uncalibrated items fall back to the defaults for their difficulty label
+    n = len(available)
+    items = np.empty(n, dtype=ITEM_BANK_DTYPE)
+    items["qv_id"] = np.fromiter((row["id"] for row in available), dtype=np.int64, count=n)
+    items["question_id"] = np.fromiter((row["question_id"] for row in available), dtype=np.int64, count=n)
+    items["version"] = np.fromiter((row["version"] for row in available), dtype=np.int32, count=n)
+    items["topic_id"] = np.fromiter(
+        (-1 if row["topic_id"] is None else row["topic_id"] for row in available),
+        dtype=np.int64, count=n
+    )
+    items["difficulty"] = np.fromiter(
+        (_DIFFICULTY_CODES.get(row["difficulty_label"], -1) for row in available),
+        dtype=np.int8, count=n
+    )
+    items["a"] = np.fromiter((row["a"] or 0.0 for row in available), dtype=np.float32, count=n)
+    items["b"] = np.fromiter((row["b"] or 0.0 for row in available), dtype=np.float32, count=n)
+    items["c"] = np.fromiter((row["c"] or 0.0 for row in available), dtype=np.float32, count=n)
+    missing = (items["a"] == 0) | (items["b"] == 0)
+    if missing.any():
+        codes = items["difficulty"][missing]
+        abc = DEFAULT_ABC[np.where(codes < 0, _MEDIUM_CODE, codes)]
+        items["a"][missing], items["b"][missing], items["c"][missing] = abc.T
+    
+    bank = ItemBank(items, {row["name"]: list(row["ids"]) for row in topic_rows})
+    blob = bank.to_bytes()
+    await cache.set_item_bank(key, blob)
+    _item_banks[key] = (blob, bank)
+    return bank
+
 async def select_random_questions(
     db: AsyncSession,
     num: int,
@@ -592,8 +767,8 @@ async def select_random_questions(
     """Select random questions based on criteria"""
     
     query = select(
-        QuestionVersion,
-        Question
+        QuestionVersion.question_id,
+        QuestionVersion.version
     ).join(
         Question, Question.id == QuestionVersion.question_id
     ).where(
@@ -601,60 +776,104 @@ async def select_random_questions(
         Question.is_deleted == False
     )
     
-    # Apply filters
+    # Apply filters; unknown topic names leave the bank unfiltered
     if topics:
-        topic_query = select(Topic.id).where(Topic.name.in_(topics))
-        topic_result = await db.execute(topic_query)
-        topic_ids = [t[0] for t in topic_result.fetchall()]
-        if topic_ids:
-            query = query.where(QuestionVersion.topic_id.in_(topic_ids))
+        topic_ids = select(Topic.id).where(Topic.name.in_(topics))
+        query = query.where(or_(
+            ~topic_ids.exists(),
+            QuestionVersion.topic_id.in_(topic_ids)
+        ))
     
     if difficulty:
         query = query.where(QuestionVersion.difficulty_label.in_(difficulty))
     
-    # Get all matching questions
-    result = await db.execute(query)
-    all_questions = result.all()
-    
-    # Randomly select requested number
-    selected = random.sample(all_questions, min(num, len(all_questions)))
+    # Sample in Postgres so only the selected rows are transferred
+    result = await db.execute(query.order_by(func.random()).limit(num))
     
     return [
         {
-            "id": q.id,
-            "version": qv.version
+            "id": question_id,
+            "version": version
         }
-        for qv, q in selected
+        for question_id, version in result.all()
     ]
 
-def calculate_theta_progression(responses: List[Dict]) -> List[float]:
-    """Calculate theta progression through the test"""
-    progression = []
-    theta = 0.0
-    
-    for i, resp in enumerate(responses):
-        # Simple EAP update
-        p = irt_engine.probability_3pl(
-            theta, 
-            resp.get("a", 1.0),
-            resp.get("b", 0.0),
-            resp.get("c", 0.0)
-        )
-        score = 1 if resp["correct"] else 0
-        
-        # Update theta
-        residual = score - p
-        info = irt_engine.information_3pl(
-            theta,
-            resp.get("a", 1.0),
-            resp.get("b", 0.0),
-            resp.get("c", 0.0)
-        )
-        
-        adjustment = residual / max(info, 0.1)
-        theta = theta + adjustment * 0.5  # Damping factor
-        theta = max(-3, min(3, theta))  # Bound theta
-        
-        progression.append(theta)
+async def load_answer_key(
+    db: AsyncSession,
+    question_id: int,
+    version: int
+) -> Optional[Dict[str, Any]]:
+    """Correct option, explanation and rationale for a question version.
+    
+    Answer content is immutable per version, so it is cached for a day and
+    a submission normally needs no query to grade.
+    """
+    answer = await cache.get_correct(question_id, version)
+    if answer is not None:
+        return answer
+    
+    query = select(
+        QuestionVersion.topic_id,
+        QuestionVersion.rationale_md,
+        QuestionOption.option_label,
+        QuestionOption.explanation_md
+    ).join(
+        QuestionOption, QuestionOption.question_version_id == QuestionVersion.id
+    ).where(
+        QuestionVersion.question_id == question_id,
+        QuestionVersion.version == version,
+        QuestionOption.is_correct == True
+    )
+    row = (await db.execute(query)).first()
+    if not row:
+        return None
     
-    return progression
\ No newline at end of file
+    answer = {
+        "topic_id": row.topic_id,
+        "label": row.option_label,
+        "explanation": row.explanation_md,
+        "rationale": row.rationale_md
+    }
+    await cache.set_correct(question_id, version, answer)
+    return answer
+
+async def load_session(quiz_id: str) -> tuple:
+    """Cached quiz session and its log-likelihood on the EAP grid.
+    
+    Sessions cached before the log-likelihood layout keep a list of response
+    dicts; both statistics are rebuilt from it and the list is dropped.
+    """
+    cached_session, loglik = await asyncio.gather(
+        cache.get_session(quiz_id),
+        cache.get_session_loglik(quiz_id)
+    )
+    if loglik is None:
+        legacy = (cached_session or {}).pop("responses", [])
+        y, a, b, c = np.array([
+            [1.0 if r["correct"] else 0.0 for r in legacy],
+            [r.get("a", 1.0) for r in legacy],
+            [r.get("b", 0.0) for r in legacy],
+            [r.get("c", 0.0) for r in legacy]
+        ], dtype=np.float64).reshape(4, -1)
+        loglik = irt_engine.eap_loglik(y, a, b, c)
+        if legacy:
+            cached_session["theta_history"] = irt_engine.theta_progression(y, a, b, c)
+    return cached_session, loglik
+
+def _warm_kernels():
+    """Run each IRT kernel once so Numba compiles or loads it from its cache"""
+    one = np.ones(1)
+    loglik = irt_engine.eap_loglik(one, one, 0 * one, 0 * one)
+    irt_engine.eap_from_loglik(loglik)
+    irt_engine.theta_progression(one, one, 0 * one, 0 * one)
+    irt_engine.progression_step(0.0, 1.0, 1.0, 0.0, 0.0)
+
+async def warmup():
+    """Startup warmup, run by main before /health/ready reports ready.
+    
+    Kernel compilation blocks, so it runs in a worker thread; the default
+    item bank is then built (or decoded from Redis) for the first quizzes.
+    """
+    await asyncio.to_thread(_warm_kernels)
+    async with AsyncSessionLocal() as db:
+        await load_item_bank(db, None)
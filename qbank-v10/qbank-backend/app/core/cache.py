@@ -1,31 +1,109 @@
 import redis.asyncio as redis
 from typing import Optional, Any, Union
-import json
+import orjson
 import pickle
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import datetime, timedelta, timezone
 from app.core.config import settings
-import hashlib
+import xxhash
+import zstandard
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# KEYS: exposure keys in preference order; ARGV: max exposures, result limit.
+# Returns the 1-based positions of the first keys still under the limit.
+FILTER_SERVEABLE_LUA = """
+local out = {}
+local limit = tonumber(ARGV[2])
+for i, k in ipairs(KEYS) do
+    if tonumber(redis.call('GET', k) or '0') < tonumber(ARGV[1]) then
+        out[#out + 1] = i
+        if #out >= limit then break end
+    end
+end
+return out
+"""
+
+# KEYS[1]: exposure key; ARGV: max exposures, TTL seconds.
+# Counts one exposure and returns 1, or returns 0 if the cap is already reached.
+TRY_RESERVE_LUA = """
+local v = redis.call('INCR', KEYS[1])
+if v == 1 then redis.call('EXPIRE', KEYS[1], ARGV[2]) end
+if v > tonumber(ARGV[1]) then
+    redis.call('DECR', KEYS[1])
+    return 0
+end
+return 1
+"""
+
+# Cached values are framed by one tag byte: raw, or zstd-compressed when the
+# serialized payload is larger than COMPRESS_MIN_SIZE bytes
+_RAW = b"\x00"
+_ZSTD = b"\x01"
+COMPRESS_MIN_SIZE = 256
+_compressor = zstandard.ZstdCompressor(level=3)
+_decompressor = zstandard.ZstdDecompressor()
+
+def _pack(data: bytes) -> bytes:
+    if len(data) > COMPRESS_MIN_SIZE:
+        return _ZSTD + _compressor.compress(data)
+    return _RAW + data
+
+def _unpack(payload: bytes) -> bytes:
+    tag = payload[:1]
+    if tag == _ZSTD:
+        return _decompressor.decompress(payload[1:])
+    if tag == _RAW:
+        return payload[1:]
+    # Unframed values written before compression or by raw commands
+    return payload
+
+# UTC day string for exposure keys, valid until the next UTC midnight
+_day_cache = {"until": 0.0, "day": ""}
+
+def _today() -> str:
+    """Current UTC day as YYYYMMDD, formatted once per day."""
+    now = time.time()
+    if now >= _day_cache["until"]:
+        _day_cache["day"] = datetime.fromtimestamp(now, timezone.utc).strftime("%Y%m%d")
+        _day_cache["until"] = (now // 86400 + 1) * 86400
+    return _day_cache["day"]
+
 class RedisCache:
     def __init__(self):
         self.redis: Optional[redis.Redis] = None
+        self.redis_bytes: Optional[redis.Redis] = None
         
     async def connect(self):
-        """Initialize Redis connection pool."""
+        """Initialize Redis connection pools.
+        
+        Decoding is a per-connection setting, so text and binary clients need
+        separate pools; they split REDIS_POOL_SIZE between them.
+        """
+        pool_size = max(1, settings.REDIS_POOL_SIZE // 2)
         self.redis = await redis.from_url(
             str(settings.REDIS_URL),
             encoding="utf-8",
             decode_responses=settings.REDIS_DECODE_RESPONSES,
-            max_connections=settings.REDIS_POOL_SIZE,
+            max_connections=pool_size,
+        )
+        self._filter_serveable = self.redis.register_script(FILTER_SERVEABLE_LUA)
+        self._try_reserve = self.redis.register_script(TRY_RESERVE_LUA)
+        # Binary payloads must bypass response decoding
+        self.redis_bytes = await redis.from_url(
+            str(settings.REDIS_URL),
+            decode_responses=False,
+            max_connections=pool_size,
         )
         
     async def disconnect(self):
         """Close Redis connection."""
         if self.redis:
             await self.redis.close()
+        if self.redis_bytes:
+            await self.redis_bytes.close()
     
     def _make_key(self, *args) -> str:
         """Generate cache key from arguments."""
@@ -35,14 +113,15 @@ class RedisCache:
     async def get(self, key: str, default: Any = None) -> Any:
         """Get value from cache."""
         try:
-            value = await self.redis.get(key)
+            value = await self.redis_bytes.get(key)
             if value is None:
                 return default
+            value = _unpack(value)
             # Try to deserialize JSON
             try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
-                return value
+                return orjson.loads(value)
+            except orjson.JSONDecodeError:
+                return value.decode()
         except Exception as e:
             logger.error(f"Cache get error: {e}")
             return default
@@ -59,11 +138,13 @@ class RedisCache:
         try:
             # Serialize to JSON if possible
             if isinstance(value, (dict, list)):
-                value = json.dumps(value)
+                value = orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+            elif not isinstance(value, bytes):
+                value = str(value).encode()
             
-            return await self.redis.set(
+            return await self.redis_bytes.set(
                 key, 
-                value, 
+                _pack(value), 
                 ex=expire or settings.CACHE_TTL,
                 nx=nx,
                 xx=xx
@@ -103,28 +184,66 @@ class RedisCache:
     # Exposure control methods
     def exposure_key(self, question_id: int, version: int) -> str:
         """Generate exposure control key."""
-        day = datetime.utcnow().strftime("%Y%m%d")
-        return f"exp:{day}:{question_id}:{version}"
+        return f"exp:{_today()}:{question_id}:{version}"
     
-    async def can_serve(self, question_id: int, version: int) -> bool:
-        """Check if question can be served based on exposure limits."""
+    def exposure_keys(self, items: list) -> list:
+        """Generate exposure control keys for (question_id, version) pairs."""
+        day = _today()
+        return [f"exp:{day}:{question_id}:{version}" for question_id, version in items]
+    
+    async def filter_serveable(self, keys: list, limit: int) -> list:
+        """Positions of the first `limit` keys under the exposure cap.
+        
+        Checks the whole list server-side in a single round-trip.
+        """
         if not settings.EXPOSURE_CONTROL_ENABLED:
-            return True
+            return list(range(min(limit, len(keys))))
+        if not keys:
+            return []
         
-        key = self.exposure_key(question_id, version)
-        count = await self.get(key, 0)
-        return int(count) < settings.MAX_DAILY_EXPOSURES
+        positions = await self._filter_serveable(
+            keys=keys, args=[settings.MAX_DAILY_EXPOSURES, limit]
+        )
+        return [int(i) - 1 for i in positions]
     
-    async def bump_exposure(self, question_id: int, version: int) -> None:
-        """Increment exposure count for question."""
+    async def try_reserve(self, question_id: int, version: int) -> bool:
+        """Atomically count an exposure if the question is under its daily cap."""
         if not settings.EXPOSURE_CONTROL_ENABLED:
-            return
+            return True
         
         key = self.exposure_key(question_id, version)
-        pipe = self.redis.pipeline()
-        pipe.incr(key, 1)
-        pipe.expire(key, 86400)  # 24 hours
-        await pipe.execute()
+        reserved = await self._try_reserve(
+            keys=[key], args=[settings.MAX_DAILY_EXPOSURES, 86400]  # 24 hours
+        )
+        return bool(reserved)
+    
+    # Item bank snapshots
+    def item_bank_key(self, exam_code: Optional[str]) -> str:
+        """Generate item bank key for an exam."""
+        return f"bank:{exam_code or '*'}"
+    
+    async def get_item_bank(self, key: str) -> Optional[bytes]:
+        """Get packed item bank bytes."""
+        try:
+            return await self.redis_bytes.get(key)
+        except Exception as e:
+            logger.error(f"Item bank get error: {e}")
+            return None
+    
+    async def set_item_bank(
+        self,
+        key: str,
+        blob: bytes,
+        expire: Optional[int] = None
+    ) -> bool:
+        """Store packed item bank bytes."""
+        try:
+            return await self.redis_bytes.set(
+                key, blob, ex=expire or settings.ITEM_BANK_TTL
+            )
+        except Exception as e:
+            logger.error(f"Item bank set error: {e}")
+            return False
     
     # Session management
     async def get_session(self, session_id: str) -> Optional[dict]:
@@ -142,6 +261,48 @@ class RedisCache:
         key = f"session:{session_id}"
         return await self.set(key, data, expire=expire)
     
+    async def get_correct(self, question_id: int, version: int) -> Optional[dict]:
+        """Get cached answer key for a question version."""
+        return await self.get(f"ans:{question_id}:{version}")
+    
+    async def set_correct(
+        self,
+        question_id: int,
+        version: int,
+        data: dict,
+        expire: int = 86400
+    ) -> bool:
+        """Set answer key for a question version with expiration."""
+        return await self.set(f"ans:{question_id}:{version}", data, expire=expire)
+    
+    async def get_session_loglik(self, session_id: str) -> Optional[np.ndarray]:
+        """Get session log-likelihood on the EAP quadrature grid."""
+        key = f"session:{session_id}:loglik"
+        try:
+            blob = await self.redis_bytes.get(key)
+        except Exception as e:
+            logger.error(f"Session loglik get error: {e}")
+            return None
+        if blob is None:
+            return None
+        return np.frombuffer(blob, dtype=np.float64)
+    
+    async def set_session_loglik(
+        self,
+        session_id: str,
+        loglik: np.ndarray,
+        expire: int = 7200
+    ) -> bool:
+        """Set session log-likelihood as packed float64 bytes."""
+        key = f"session:{session_id}:loglik"
+        try:
+            return await self.redis_bytes.set(
+                key, np.ascontiguousarray(loglik, dtype=np.float64).tobytes(), ex=expire
+            )
+        except Exception as e:
+            logger.error(f"Session loglik set error: {e}")
+            return False
+    
     # Rate limiting
     async def check_rate_limit(
         self, 
@@ -179,8 +340,12 @@ class RedisCache:
                     cache_key = key_builder(*args, **kwargs)
                 else:
                     # Simple key from function name and args
-                    key_data = f"{func.__name__}:{args}:{kwargs}"
-                    key_hash = hashlib.md5(key_data.encode()).hexdigest()
+                    key_data = orjson.dumps(
+                        (func.__name__, args, kwargs),
+                        option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                        default=str
+                    )
+                    key_hash = xxhash.xxh3_64_hexdigest(key_data)
                     cache_key = f"{prefix}:{key_hash}"
                 
                 # Try to get from cache
@@ -1,9 +1,17 @@
 import os
-from typing import List, Optional
-from pydantic_settings import BaseSettings
+from functools import cached_property, lru_cache
+from typing import Collection, List, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, SecretStr, PostgresDsn, RedisDsn
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        extra="ignore",
+    )
+    
     # Application
     APP_NAME: str = "QBank API"
     APP_VERSION: str = "10.0.0"
@@ -25,12 +33,16 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 40
     DATABASE_POOL_TIMEOUT: int = 30
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds before a pooled connection is replaced
+    DATABASE_POOL_PRE_PING: bool = False
+    DATABASE_STATEMENT_CACHE_SIZE: int = 500  # asyncpg prepared statements per connection
     
     # Redis
     REDIS_URL: str = Field(default="redis://localhost:6379/0")
     REDIS_POOL_SIZE: int = 50
     REDIS_DECODE_RESPONSES: bool = True
     CACHE_TTL: int = 3600  # 1 hour
+    ITEM_BANK_TTL: int = 600  # adaptive item bank snapshot, 10 minutes
     
     # Kafka
     KAFKA_BOOTSTRAP_SERVERS: str = "localhost:9092"
@@ -87,8 +99,19 @@ class Settings(BaseSettings):
     FEATURE_BULK_IMPORT: bool = True
     FEATURE_ADVANCED_ANALYTICS: bool = True
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    @cached_property
+    def cors_origins(self) -> Collection[str]:
+        """CORS origins as a frozenset for constant-time checks, unless wildcard."""
+        if "*" in self.CORS_ORIGINS:
+            return self.CORS_ORIGINS
+        return frozenset(self.CORS_ORIGINS)
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide settings, parsed from the environment once."""
+    return Settings()
+
+settings = get_settings()
 
-settings = Settings()
\ No newline at end of file
+# Signing key as bytes, unwrapped once for token signing and verification
+SECRET_KEY_BYTES: bytes = settings.SECRET_KEY.get_secret_value().encode()
\ No newline at end of file
@@ -1,4 +1,5 @@
 from typing import AsyncGenerator
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.pool import NullPool
@@ -14,8 +15,16 @@ engine = create_async_engine(
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     pool_timeout=settings.DATABASE_POOL_TIMEOUT,
-    pool_pre_ping=True,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
     poolclass=None if settings.ENVIRONMENT != "test" else NullPool,
+    connect_args={
+        # SQLAlchemy's statement cache, and asyncpg's own for raw driver queries
+        "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        # Short OLTP queries gain nothing from JIT compilation
+        "server_settings": {"jit": "off"},
+    },
 )
 
 # Create async session factory
@@ -42,10 +51,35 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+async def driver_connection(session: AsyncSession):
+    """Return the asyncpg connection behind a session's current transaction.
+    
+    Hot read paths use it to run fixed SQL through asyncpg's per-connection
+    prepared statement cache, skipping ORM row construction.
+    """
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    return raw.driver_connection
+
+def pool_status() -> dict:
+    """Snapshot of the process-wide connection pool."""
+    pool = engine.pool
+    status = {"status": pool.status()}
+    if hasattr(pool, "checkedout"):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return status
+
 async def init_db():
     """Initialize database, create tables if they don't exist."""
     async with engine.begin() as conn:
         # In production, use Alembic migrations instead
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pgcrypto"))
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
         await conn.run_sync(Base.metadata.create_all)
 
 async def close_db():
@@ -5,16 +5,16 @@ Main FastAPI Application
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import time
 from prometheus_client import make_asgi_app
 
 from app.core.config import settings
-from app.core.database import init_db, close_db
+from app.core.database import init_db, close_db, pool_status
 from app.core.cache import cache
-from app.api import auth, quizzes, author, admin, analytics, calibration
 
 # Configure logging
 logging.basicConfig(
@@ -23,12 +23,64 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Set once deferred startup work has finished; gates /health/ready
+_ready = asyncio.Event()
+
+# Coroutine functions run as deferred warmup after startup; routers supply
+# them as a module-level ``warmup`` collected by _register_routers
+_on_ready_callbacks = []
+
+async def _deferred_init():
+    """Run warmup work after the server starts listening."""
+    for callback in _on_ready_callbacks:
+        await callback()
+    
+    _ready.set()
+    logger.info("Application ready")
+
+def _log_deferred_failure(task: asyncio.Task):
+    """Surface errors from the deferred task, which nothing awaits."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Deferred startup failed", exc_info=task.exception())
+
+# Set once the API routers are mounted; lifespan can run more than once
+# per process (e.g. repeated TestClient contexts)
+_routers_registered = False
+
+def _register_routers(app: FastAPI):
+    """Import and mount the API routers, once.
+    
+    Called from lifespan so the routers' ORM, Pydantic and numerical
+    imports stay out of the module import chain.
+    """
+    global _routers_registered
+    if _routers_registered:
+        return
+    _routers_registered = True
+    
+    from app.api import auth, quizzes, author, admin, analytics, calibration
+    
+    for module in (auth, quizzes, author, admin, analytics, calibration):
+        warmup = getattr(module, "warmup", None)
+        if warmup is not None:
+            _on_ready_callbacks.append(warmup)
+    
+    app.include_router(auth.router, prefix=f"{settings.API_V1_PREFIX}/auth", tags=["Authentication"])
+    app.include_router(quizzes.router, prefix=f"{settings.API_V1_PREFIX}/quizzes", tags=["Quizzes"])
+    app.include_router(author.router, prefix=f"{settings.API_V1_PREFIX}/author", tags=["Authoring"])
+    app.include_router(admin.router, prefix=f"{settings.API_V1_PREFIX}/admin", tags=["Admin"])
+    app.include_router(analytics.router, prefix=f"{settings.API_V1_PREFIX}/analytics", tags=["Analytics"])
+    app.include_router(calibration.router, prefix=f"{settings.API_V1_PREFIX}/calibration", tags=["Calibration"])
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle."""
     # Startup
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     
+    # Routers import the models, so this precedes create_all in init_db
+    _register_routers(app)
+    
     # Initialize database
     await init_db()
     logger.info("Database initialized")
@@ -37,10 +89,16 @@ async def lifespan(app: FastAPI):
     await cache.connect()
     logger.info("Cache connected")
     
+    # Warmup runs off the bind path
+    deferred = asyncio.create_task(_deferred_init())
+    deferred.add_done_callback(_log_deferred_failure)
+    
     yield
     
     # Shutdown
     logger.info("Shutting down application")
+    if not deferred.done():
+        deferred.cancel()
     await cache.disconnect()
     await close_db()
 
@@ -50,6 +108,7 @@ app = FastAPI(
     version=settings.APP_VERSION,
     debug=settings.DEBUG,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
 )
@@ -57,28 +116,41 @@ app = FastAPI(
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 # Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
-
-# Include routers
-app.include_router(auth.router, prefix=f"{settings.API_V1_PREFIX}/auth", tags=["Authentication"])
-app.include_router(quizzes.router, prefix=f"{settings.API_V1_PREFIX}/quizzes", tags=["Quizzes"])
-app.include_router(author.router, prefix=f"{settings.API_V1_PREFIX}/author", tags=["Authoring"])
-app.include_router(admin.router, prefix=f"{settings.API_V1_PREFIX}/admin", tags=["Admin"])
-app.include_router(analytics.router, prefix=f"{settings.API_V1_PREFIX}/analytics", tags=["Analytics"])
-app.include_router(calibration.router, prefix=f"{settings.API_V1_PREFIX}/calibration", tags=["Calibration"])
+class ProcessTimeMiddleware:
+    """Add an X-Process-Time header (milliseconds) to every HTTP response.
+    
+    Plain ASGI rather than BaseHTTPMiddleware, so requests are not bridged
+    through an extra task and streaming bodies pass through untouched.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_ns = time.perf_counter_ns()
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                elapsed_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+                headers = list(message.get("headers", ()))
+                headers.append((b"x-process-time", f"{elapsed_ms:.3f}ms".encode()))
+                message["headers"] = headers
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+
+app.add_middleware(ProcessTimeMiddleware)
 
 # Mount Prometheus metrics endpoint
 if settings.ENABLE_METRICS:
@@ -96,6 +168,27 @@ async def health_check():
         "timestamp": time.time()
     }
 
+# Liveness: the process is up and serving requests
+@app.get("/health/live")
+async def health_live():
+    """Liveness probe."""
+    return {"status": "alive"}
+
+# Readiness: deferred startup has finished
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness probe."""
+    if not _ready.is_set():
+        return ORJSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
+
+# Connection pool status, exposed in debug mode only
+if settings.DEBUG:
+    @app.get("/debug/pool")
+    async def debug_pool():
+        """Database connection pool status."""
+        return pool_status()
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -116,7 +209,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
     
     if settings.DEBUG:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "error": "Internal server error",
@@ -125,17 +218,23 @@ async def global_exception_handler(request: Request, exc: Exception):
             }
         )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": "Internal server error"}
     )
 
 if __name__ == "__main__":
     import uvicorn
+    # uvloop and httptools come with uvicorn[standard]; naming them makes a
+    # missing extra fail at startup instead of falling back to asyncio + h11
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
-        log_level="debug" if settings.DEBUG else "info"
+        log_level="debug" if settings.DEBUG else "info",
+        loop="uvloop",
+        http="httptools",
+        access_log=settings.DEBUG,
+        proxy_headers=False
     )
\ No newline at end of file
@@ -1,13 +1,13 @@
 from sqlalchemy import (
-    BigInteger, Integer, String, Text, Boolean, Float, 
-    ForeignKey, JSON, DateTime, UniqueConstraint, Index,
-    CheckConstraint, Enum as SQLEnum, func
+    BigInteger, Integer, SmallInteger, String, Text, Boolean, Float, 
+    ForeignKey, DateTime, UniqueConstraint, Index,
+    CheckConstraint, Computed, Enum as SQLEnum, func, text
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY, TSVECTOR
+from pgvector.sqlalchemy import Vector
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-import uuid
 import enum
 from app.core.database import Base
 
@@ -51,10 +51,12 @@ class Topic(Base):
     description: Mapped[Optional[str]] = mapped_column(Text)
     weight: Mapped[float] = mapped_column(Float, default=1.0)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    metadata: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    extra_metadata: Mapped[Dict[str, Any]] = mapped_column("metadata", JSONB, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=func.now(), onupdate=func.now()
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
     
     # Relationships
@@ -83,9 +85,11 @@ class Question(Base):
     external_ref: Mapped[Optional[str]] = mapped_column(String(100))
     created_by: Mapped[str] = mapped_column(String(255), nullable=False)
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
-    metadata: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    extra_metadata: Mapped[Dict[str, Any]] = mapped_column("metadata", JSONB, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     
     # Relationships
     versions: Mapped[List["QuestionVersion"]] = relationship(
@@ -103,6 +107,11 @@ class QuestionVersion(Base):
         Index("idx_qv_state", "state"),
         Index("idx_qv_version", "version"),
         Index("idx_qv_search", "search_vector", postgresql_using="gin"),
+        Index(
+            "idx_qv_embedding", "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "vector_cosine_ops"}
+        ),
         UniqueConstraint("question_id", "version", name="uq_question_version"),
     )
     
@@ -128,23 +137,29 @@ class QuestionVersion(Base):
     assets: Mapped[List[Dict]] = mapped_column(JSONB, default=list)
     references: Mapped[List[Dict]] = mapped_column(JSONB, default=list)
     search_vector: Mapped[Optional[str]] = mapped_column(TSVECTOR)
-    embedding: Mapped[Optional[List[float]]] = mapped_column(ARRAY(Float))
-    metadata: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    embedding: Mapped[Optional[List[float]]] = mapped_column(Vector(384))  # all-MiniLM-L6-v2
+    extra_metadata: Mapped[Dict[str, Any]] = mapped_column("metadata", JSONB, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=func.now(), onupdate=func.now()
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
     reviewed_by: Mapped[Optional[str]] = mapped_column(String(255))
-    reviewed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    reviewed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     
     # Relationships
     question: Mapped["Question"] = relationship(back_populates="versions")
     topic: Mapped[Optional["Topic"]] = relationship(back_populates="questions")
     options: Mapped[List["QuestionOption"]] = relationship(
-        back_populates="question_version", cascade="all, delete-orphan"
+        back_populates="question_version", cascade="all, delete-orphan",
+        lazy="selectin", order_by="QuestionOption.option_label"
     )
     calibrations: Mapped[List["ItemCalibration"]] = relationship(
-        back_populates="question_version"
+        foreign_keys="[ItemCalibration.question_id, ItemCalibration.version]",
+        primaryjoin="and_(QuestionVersion.question_id==ItemCalibration.question_id, "
+                   "QuestionVersion.version==ItemCalibration.version)",
+        viewonly=True,
     )
 
 class QuestionOption(Base):
@@ -166,7 +181,7 @@ class QuestionOption(Base):
     option_text_md: Mapped[str] = mapped_column(Text, nullable=False)
     is_correct: Mapped[bool] = mapped_column(Boolean, nullable=False)
     explanation_md: Mapped[Optional[str]] = mapped_column(Text)
-    metadata: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict)
+    extra_metadata: Mapped[Dict[str, Any]] = mapped_column("metadata", JSONB, default=dict)
     
     # Relationships
     question_version: Mapped["QuestionVersion"] = relationship(
@@ -193,10 +208,12 @@ class QuestionPublication(Base):
     live_version: Mapped[int] = mapped_column(Integer, nullable=False)
     exam_code: Mapped[str] = mapped_column(String(50), nullable=False)
     tenant_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
-    published_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    published_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
     published_by: Mapped[str] = mapped_column(String(255), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    metadata: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict)
+    extra_metadata: Mapped[Dict[str, Any]] = mapped_column("metadata", JSONB, default=dict)
     
     # Relationships
     question: Mapped["Question"] = relationship(back_populates="publications")
@@ -217,7 +234,7 @@ class QuizSession(Base):
     )
     
     id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
     user_id: Mapped[str] = mapped_column(String(255), nullable=False)
     tenant_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
@@ -227,11 +244,13 @@ class QuizSession(Base):
     adaptive: Mapped[bool] = mapped_column(Boolean, default=False)
     exam_code: Mapped[Optional[str]] = mapped_column(String(50))
     config: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict)
-    started_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     score: Mapped[Optional[float]] = mapped_column(Float)
-    metadata: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict)
+    extra_metadata: Mapped[Dict[str, Any]] = mapped_column("metadata", JSONB, default=dict)
     
     # Relationships
     items: Mapped[List["QuizItem"]] = relationship(
@@ -244,9 +263,13 @@ class QuizSession(Base):
 class QuizItem(Base):
     __tablename__ = "quiz_items"
     __table_args__ = (
-        Index("idx_qi_quiz", "quiz_id"),
+        # Enforces one item per position and serves quiz walks index-only
+        Index(
+            "idx_qi_quiz_position", "quiz_id", "position",
+            unique=True,
+            postgresql_include=["question_id", "version"]
+        ),
         Index("idx_qi_question", "question_id"),
-        UniqueConstraint("quiz_id", "position", name="uq_quiz_item_position"),
     )
     
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
@@ -258,8 +281,10 @@ class QuizItem(Base):
     question_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     version: Mapped[int] = mapped_column(Integer, nullable=False)
     position: Mapped[int] = mapped_column(Integer, nullable=False)
-    served_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    metadata: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict)
+    served_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    extra_metadata: Mapped[Dict[str, Any]] = mapped_column("metadata", JSONB, default=dict)
     
     # Relationships
     session: Mapped["QuizSession"] = relationship(back_populates="items")
@@ -267,8 +292,16 @@ class QuizItem(Base):
 class UserResponse(Base):
     __tablename__ = "user_responses"
     __table_args__ = (
-        Index("idx_ur_quiz", "quiz_id"),
-        Index("idx_ur_user", "user_id"),
+        # Covers score and time aggregation with an index-only scan
+        Index(
+            "idx_ur_quiz", "quiz_id",
+            postgresql_include=["is_correct_int", "time_taken_ms"]
+        ),
+        # A user's history, newest first, without heap fetches
+        Index(
+            "idx_ur_user_time_covering", "user_id", "created_at",
+            postgresql_include=["question_id", "version", "is_correct", "option_label"]
+        ),
         Index("idx_ur_question", "question_id", "version"),
         Index("idx_ur_created", "created_at"),
         UniqueConstraint(
@@ -288,10 +321,16 @@ class UserResponse(Base):
     version: Mapped[int] = mapped_column(Integer, nullable=False)
     option_label: Mapped[str] = mapped_column(String(1), nullable=False)
     is_correct: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    is_correct_int: Mapped[int] = mapped_column(
+        SmallInteger,
+        Computed("CASE WHEN is_correct THEN 1 ELSE 0 END", persisted=True)
+    )
     time_taken_ms: Mapped[Optional[int]] = mapped_column(Integer)
     confidence: Mapped[Optional[int]] = mapped_column(Integer)
-    metadata: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    extra_metadata: Mapped[Dict[str, Any]] = mapped_column("metadata", JSONB, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
     
     # Relationships
     session: Mapped["QuizSession"] = relationship(back_populates="responses")
@@ -317,7 +356,9 @@ class ItemCalibration(Base):
     se_c: Mapped[Optional[float]] = mapped_column(Float)
     n_respondents: Mapped[Optional[int]] = mapped_column(Integer)
     fit_statistics: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict)
-    calibrated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    calibrated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
     
     # Relationships
     question_version: Mapped["QuestionVersion"] = relationship(
@@ -339,7 +380,7 @@ class ItemExposureControl(Base):
     sh_p: Mapped[float] = mapped_column(Float, default=1.0, nullable=False)
     exposure_count: Mapped[int] = mapped_column(Integer, default=0)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=func.now(), onupdate=func.now()
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
 class UserAbility(Base):
@@ -348,7 +389,12 @@ class UserAbility(Base):
         Index("idx_ua_user", "user_id"),
         Index("idx_ua_topic", "topic_id"),
         Index("idx_ua_updated", "updated_at"),
-        UniqueConstraint("user_id", "topic_id", name="uq_user_ability"),
+        # One row per user and topic, counting the NULL (global) topic_id
+        # as a value so upserts can target it with ON CONFLICT
+        Index(
+            "uq_user_ability", "user_id", text("COALESCE(topic_id, -1)"),
+            unique=True
+        ),
     )
     
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
@@ -358,7 +404,7 @@ class UserAbility(Base):
     theta_se: Mapped[float] = mapped_column(Float, default=1.0)
     n_responses: Mapped[int] = mapped_column(Integer, default=0)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=func.now(), onupdate=func.now()
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
 # ========== Governance Models ==========
@@ -373,7 +419,7 @@ class FeatureFlag(Base):
     enabled: Mapped[bool] = mapped_column(Boolean, default=True)
     value_json: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=func.now(), onupdate=func.now()
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
 class CohortAssignment(Base):
@@ -386,7 +432,9 @@ class CohortAssignment(Base):
     user_id: Mapped[str] = mapped_column(String(255), primary_key=True)
     cohort_key: Mapped[str] = mapped_column(String(100), primary_key=True)
     cohort_value: Mapped[str] = mapped_column(String(255), nullable=False)
-    assigned_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    assigned_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
 
 class CalibrationRun(Base):
     __tablename__ = "calibration_runs"
@@ -397,7 +445,7 @@ class CalibrationRun(Base):
     )
     
     id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
     exam_code: Mapped[str] = mapped_column(String(50), nullable=False)
     status: Mapped[str] = mapped_column(String(20), nullable=False)
@@ -405,9 +453,11 @@ class CalibrationRun(Base):
     history: Mapped[List[Dict]] = mapped_column(JSONB, default=list)
     result: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB)
     error: Mapped[Optional[str]] = mapped_column(Text)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
-    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
@@ -423,5 +473,7 @@ class AuditLog(Base):
     entity_type: Mapped[str] = mapped_column(String(50), nullable=False)
     entity_id: Mapped[str] = mapped_column(String(255), nullable=False)
     changes: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict)
-    metadata: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
\ No newline at end of file
+    extra_metadata: Mapped[Dict[str, Any]] = mapped_column("metadata", JSONB, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
\ No newline at end of file
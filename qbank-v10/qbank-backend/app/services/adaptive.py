@@ -4,16 +4,84 @@ Enhanced Adaptive Testing Engine with IRT
 import math
 import random
 import numpy as np
+from scipy.special import expit
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 import logging
 
+try:
+    from numba import njit
+except ImportError:  # kernels run as plain Python loops
+    njit = None
+
 logger = logging.getLogger(__name__)
 
 # IRT Constants
 D = 1.7  # Scaling constant for logistic IRT models
 
+# EAP quadrature grid, built once; the prior is applied per call in log space
+EAP_QUAD_NODES = np.linspace(-4.0, 4.0, 61)
+
+def _logistic_pair(x):
+    """Return (sigmoid(x), 1 - sigmoid(x)) without overflow or cancellation."""
+    if x >= 0:
+        e = math.exp(-x)
+        return 1.0 / (1.0 + e), e / (1.0 + e)
+    e = math.exp(x)
+    return e / (1.0 + e), 1.0 / (1.0 + e)
+
+def _loglik_kernel(correct, a, b, c, nodes):
+    """Summed 3PL response log-likelihood at each quadrature node."""
+    n_nodes = nodes.shape[0]
+    loglik = np.zeros(n_nodes)
+    for k in range(n_nodes):
+        ll = 0.0
+        for j in range(a.shape[0]):
+            s, s_bar = _logistic_pair(D * a[j] * (nodes[k] - b[j]))
+            if correct[j] > 0.5:
+                ll += math.log(max(c[j] + (1.0 - c[j]) * s, 1e-300))
+            else:
+                ll += math.log(max((1.0 - c[j]) * s_bar, 1e-300))
+        loglik[k] = ll
+    return loglik
+
+def _loglik_numpy(correct, a, b, c, nodes):
+    """NumPy form of _loglik_kernel, used when numba is unavailable."""
+    x = D * a * (nodes[:, None] - b)
+    log_p = np.log(np.maximum(c + (1.0 - c) * expit(x), 1e-300))
+    log_q = np.log(np.maximum((1.0 - c) * expit(-x), 1e-300))
+    return np.where(correct > 0.5, log_p, log_q).sum(axis=1)
+
+def _progression_step(theta, correct, a, b, c):
+    """One damped scoring step from theta after a response (3PL)."""
+    s, s_bar = _logistic_pair(D * a * (theta - b))
+    p = c + (1.0 - c) * s
+    q = (1.0 - c) * s_bar
+    info = 0.0
+    if p > 0.0 and q > 0.0 and c < 1.0:
+        info = (D * a) ** 2 * (q / p) * ((p - c) / (1.0 - c)) ** 2
+    theta += 0.5 * (correct - p) / max(info, 0.1)
+    return min(max(theta, -3.0), 3.0)
+
+def _progression_kernel(correct, a, b, c, theta):
+    """Damped one-step theta updates after each response (3PL)."""
+    progression = np.empty(a.shape[0])
+    for j in range(a.shape[0]):
+        theta = _progression_step(theta, correct[j], a[j], b[j], c[j])
+        progression[j] = theta
+    return progression
+
+# Safe fastmath subset shared by every Numba kernel: FMA contraction and
+# reassociation, but no nnan/ninf, so kernels may still produce inf/NaN
+FASTMATH = {"contract", "afn", "reassoc", "nsz", "arcp"}
+
+if njit is not None:
+    _logistic_pair = njit(cache=True, fastmath=FASTMATH)(_logistic_pair)
+    _loglik_kernel = njit(cache=True, fastmath=FASTMATH)(_loglik_kernel)
+    _progression_step = njit(cache=True, fastmath=FASTMATH)(_progression_step)
+    _progression_kernel = njit(cache=True, fastmath=FASTMATH)(_progression_kernel)
+
 class SelectionStrategy(Enum):
     """Item selection strategies for adaptive testing."""
     MAXIMUM_INFORMATION = "max_info"
@@ -83,6 +151,23 @@ class IRTEngine:
             return 0.0
         return (D ** 2) * (a ** 2) * (q / p) * ((p - c) / (1.0 - c)) ** 2
     
+    @staticmethod
+    def fisher_info_3pl_vec(
+        theta: float,
+        a: np.ndarray,
+        b: np.ndarray,
+        c: np.ndarray
+    ) -> np.ndarray:
+        """Fisher information for 3PL model over parameter arrays."""
+        dtype = np.result_type(a, b, c)
+        a, b, c = (np.asarray(x, dtype=dtype) for x in (a, b, c))
+        p = c + (1.0 - c) * expit(D * a * (theta - b))
+        q = 1.0 - p
+        with np.errstate(divide="ignore", invalid="ignore"):
+            info = (D ** 2) * (a * a) * (q / p) * ((p - c) / (1.0 - c)) ** 2
+        valid = (p > 0) & (q > 0) & (c < 1.0)
+        return np.where(valid, info, 0.0).astype(dtype, copy=False)
+    
     @staticmethod
     def likelihood_2pl(
         responses: List[Tuple[ItemParameters, bool]], 
@@ -162,6 +247,87 @@ class IRTEngine:
         
         return theta, se
     
+    @staticmethod
+    def eap_loglik(
+        correct: np.ndarray,
+        a: np.ndarray,
+        b: np.ndarray,
+        c: np.ndarray
+    ) -> np.ndarray:
+        """Response log-likelihood on EAP_QUAD_NODES (3PL).
+        
+        Log-likelihoods of separate responses add, so a running sum is a
+        sufficient statistic for EAP updates one response at a time.
+        """
+        correct, a, b, c = (
+            np.atleast_1d(np.asarray(x, dtype=np.float64)) for x in (correct, a, b, c)
+        )
+        kernel = _loglik_kernel if njit is not None else _loglik_numpy
+        return kernel(correct, a, b, c, EAP_QUAD_NODES)
+    
+    @staticmethod
+    def eap_from_loglik(
+        loglik: np.ndarray,
+        prior_mean: float = 0.0,
+        prior_sd: float = 1.0
+    ) -> Tuple[float, float]:
+        """EAP estimate and SE of theta from log-likelihood on the grid."""
+        log_post = loglik - 0.5 * ((EAP_QUAD_NODES - prior_mean) / prior_sd) ** 2
+        weights = np.exp(log_post - log_post.max())
+        weights /= weights.sum()
+        theta = weights @ EAP_QUAD_NODES
+        return float(theta), math.sqrt(weights @ (EAP_QUAD_NODES - theta) ** 2)
+    
+    @staticmethod
+    def estimate_theta_eap(
+        correct: np.ndarray,
+        a: np.ndarray,
+        b: np.ndarray,
+        c: np.ndarray,
+        prior_mean: float = 0.0,
+        prior_sd: float = 1.0
+    ) -> Tuple[float, float]:
+        """EAP estimate of theta from response and 3PL parameter arrays."""
+        if np.size(correct) == 0:
+            return prior_mean, prior_sd
+        
+        return IRTEngine.eap_from_loglik(
+            IRTEngine.eap_loglik(correct, a, b, c), prior_mean, prior_sd
+        )
+    
+    @staticmethod
+    def theta_progression(
+        correct: np.ndarray,
+        a: np.ndarray,
+        b: np.ndarray,
+        c: np.ndarray,
+        theta: float = 0.0
+    ) -> List[float]:
+        """Running theta after each response using damped scoring steps."""
+        if np.size(correct) == 0:
+            return []
+        
+        return _progression_kernel(
+            np.atleast_1d(np.asarray(correct, dtype=np.float64)),
+            np.atleast_1d(np.asarray(a, dtype=np.float64)),
+            np.atleast_1d(np.asarray(b, dtype=np.float64)),
+            np.atleast_1d(np.asarray(c, dtype=np.float64)),
+            float(theta)
+        ).tolist()
+    
+    @staticmethod
+    def progression_step(
+        theta: float,
+        correct: float,
+        a: float,
+        b: float,
+        c: float
+    ) -> float:
+        """Next progression theta after one response."""
+        return float(_progression_step(
+            float(theta), float(correct), float(a), float(b), float(c)
+        ))
+    
     @staticmethod
     def eap_theta(
         responses: List[Tuple[ItemParameters, bool]], 
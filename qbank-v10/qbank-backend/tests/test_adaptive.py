@@ -0,0 +1,130 @@
+"""
+Regression tests for the vectorized IRT paths against the scalar references
+"""
+
+import numpy as np
+import pytest
+
+from app.services import adaptive
+from app.services.adaptive import IRTEngine, ItemParameters
+
+
+@pytest.fixture
+def items():
+    rng = np.random.default_rng(7)
+    n = 40
+    a = rng.uniform(0.4, 2.5, n)
+    b = rng.uniform(-3.0, 3.0, n)
+    c = rng.uniform(0.0, 0.3, n)
+    correct = (rng.random(n) < 0.6).astype(float)
+    return correct, a, b, c
+
+
+def _reference_progression(correct, a, b, c, theta=0.0):
+    """Damped scoring loop the progression kernel replaced"""
+    progression = []
+    for y, aj, bj, cj in zip(correct, a, b, c):
+        p = IRTEngine.prob_3pl(theta, aj, bj, cj)
+        info = IRTEngine.fisher_info_3pl(theta, aj, bj, cj)
+        theta = theta + 0.5 * (y - p) / max(info, 0.1)
+        theta = max(-3, min(3, theta))
+        progression.append(theta)
+    return progression
+
+
+class TestFisherInformation:
+    """fisher_info_3pl_vec against fisher_info_3pl"""
+    
+    @pytest.mark.parametrize("theta", [-4.0, -1.3, 0.0, 0.7, 4.0])
+    def test_matches_scalar(self, items, theta):
+        _, a, b, c = items
+        expected = [IRTEngine.fisher_info_3pl(theta, *abc) for abc in zip(a, b, c)]
+        
+        np.testing.assert_allclose(
+            IRTEngine.fisher_info_3pl_vec(theta, a, b, c), expected, rtol=1e-9, atol=1e-12
+        )
+    
+    def test_degenerate_items_have_no_information(self):
+        info = IRTEngine.fisher_info_3pl_vec(
+            0.0, np.array([1.0, 1.0]), np.array([0.0, 0.0]), np.array([1.0, 0.2])
+        )
+        
+        assert info[0] == 0.0
+        assert info[1] == pytest.approx(IRTEngine.fisher_info_3pl(0.0, 1.0, 0.0, 0.2))
+    
+    def test_keeps_float32_bank_dtype(self, items):
+        _, a, b, c = (x.astype(np.float32) for x in items)
+        
+        assert IRTEngine.fisher_info_3pl_vec(0.5, a, b, c).dtype == np.float32
+
+
+class TestEAP:
+    """Grid log-likelihood EAP against eap_theta"""
+    
+    def test_batch_matches_scalar(self, items):
+        correct, a, b, c = items
+        responses = [
+            (ItemParameters(question_id=j, version=1, a=a[j], b=b[j], c=c[j]), bool(correct[j]))
+            for j in range(len(a))
+        ]
+        
+        theta, se = IRTEngine.estimate_theta_eap(correct, a, b, c)
+        ref_theta, ref_se = IRTEngine.eap_theta(responses)
+        
+        assert theta == pytest.approx(ref_theta, abs=1e-9)
+        assert se == pytest.approx(ref_se, abs=1e-9)
+    
+    def test_incremental_matches_batch(self, items):
+        correct, a, b, c = items
+        loglik = np.zeros_like(adaptive.EAP_QUAD_NODES)
+        
+        for j in range(len(a)):
+            loglik = loglik + IRTEngine.eap_loglik(correct[j], a[j], b[j], c[j])
+            theta, se = IRTEngine.eap_from_loglik(loglik)
+            
+            ref_theta, ref_se = IRTEngine.estimate_theta_eap(
+                correct[:j + 1], a[:j + 1], b[:j + 1], c[:j + 1]
+            )
+            assert theta == pytest.approx(ref_theta, abs=1e-9)
+            assert se == pytest.approx(ref_se, abs=1e-9)
+    
+    def test_numpy_fallback_matches_kernel(self, items):
+        correct, a, b, c = items
+        
+        np.testing.assert_allclose(
+            adaptive._loglik_numpy(correct, a, b, c, adaptive.EAP_QUAD_NODES),
+            IRTEngine.eap_loglik(correct, a, b, c),
+            rtol=1e-9
+        )
+    
+    def test_no_responses_returns_prior(self):
+        empty = np.array([])
+        
+        assert IRTEngine.estimate_theta_eap(empty, empty, empty, empty, 0.5, 2.0) == (0.5, 2.0)
+
+
+class TestThetaProgression:
+    """Progression kernel and single steps against the scalar loop"""
+    
+    def test_matches_reference(self, items):
+        correct, a, b, c = items
+        
+        np.testing.assert_allclose(
+            IRTEngine.theta_progression(correct, a, b, c),
+            _reference_progression(correct, a, b, c),
+            rtol=1e-9, atol=1e-12
+        )
+    
+    def test_steps_match_batch(self, items):
+        correct, a, b, c = items
+        theta, steps = 0.0, []
+        for args in zip(correct, a, b, c):
+            theta = IRTEngine.progression_step(theta, *args)
+            steps.append(theta)
+        
+        assert steps == pytest.approx(IRTEngine.theta_progression(correct, a, b, c), abs=1e-12)
+    
+    def test_scalar_input(self):
+        assert IRTEngine.theta_progression(1.0, 1.2, 0.0, 0.2) == pytest.approx(
+            _reference_progression([1.0], [1.2], [0.0], [0.2])
+        )
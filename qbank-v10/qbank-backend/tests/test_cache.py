@@ -0,0 +1,50 @@
+"""
+Cache helper tests that need no Redis server
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core import cache as cache_module
+
+
+class TestToday:
+    """UTC day strings roll over at midnight, not at local midnight"""
+    
+    def test_rolls_over_at_utc_midnight(self, monkeypatch):
+        midnight = datetime(2024, 3, 1, tzinfo=timezone.utc).timestamp()
+        monkeypatch.setattr(cache_module, "_day_cache", {"until": 0.0, "day": ""})
+        
+        monkeypatch.setattr(cache_module.time, "time", lambda: midnight - 1)
+        assert cache_module._today() == "20240229"
+        monkeypatch.setattr(cache_module.time, "time", lambda: midnight)
+        assert cache_module._today() == "20240301"
+
+
+class TestConnect:
+    """Text and binary clients share the configured connection budget"""
+    
+    async def _connect(self, monkeypatch, pool_size):
+        sizes = []
+        
+        class FakeRedis:
+            def register_script(self, script):
+                return script
+        
+        async def from_url(url, **kwargs):
+            sizes.append(kwargs["max_connections"])
+            return FakeRedis()
+        
+        monkeypatch.setattr(cache_module.redis, "from_url", from_url)
+        monkeypatch.setattr(cache_module.settings, "REDIS_POOL_SIZE", pool_size)
+        await cache_module.RedisCache().connect()
+        return sizes
+    
+    @pytest.mark.asyncio
+    async def test_pools_split_the_configured_size(self, monkeypatch):
+        assert await self._connect(monkeypatch, 50) == [25, 25]
+    
+    @pytest.mark.asyncio
+    async def test_each_pool_keeps_a_connection(self, monkeypatch):
+        assert await self._connect(monkeypatch, 1) == [1, 1]
@@ -0,0 +1,24 @@
+"""
+Import smoke tests: the API modules load and the ORM mappers configure
+"""
+
+from sqlalchemy.orm import configure_mappers
+
+
+def test_quizzes_module_imports():
+    from app.api import quizzes
+    
+    assert quizzes.router is not None
+    assert quizzes.irt_engine is not None
+
+
+def test_orm_mappers_configure():
+    import app.models.orm  # noqa: F401
+    
+    configure_mappers()
+
+
+def test_main_app_imports():
+    from app.main import app
+    
+    assert app.title
@@ -0,0 +1,75 @@
+"""
+Startup and health endpoint tests
+"""
+
+import asyncio
+import logging
+import sys
+import types
+
+import pytest
+from fastapi import APIRouter, FastAPI
+
+import app.api
+from app import main
+
+
+@pytest.fixture
+def fresh_ready(monkeypatch):
+    monkeypatch.setattr(main, "_ready", asyncio.Event())
+    monkeypatch.setattr(main, "_on_ready_callbacks", [])
+
+
+class TestDeferredInit:
+    """Warmup callbacks gate readiness and their failures are logged"""
+    
+    @pytest.mark.asyncio
+    async def test_ready_after_callbacks(self, fresh_ready):
+        calls = []
+        
+        async def warm():
+            calls.append("warm")
+        
+        main._on_ready_callbacks.append(warm)
+        await main._deferred_init()
+        
+        assert calls == ["warm"]
+        assert main._ready.is_set()
+    
+    @pytest.mark.asyncio
+    async def test_failure_is_logged(self, fresh_ready, caplog):
+        async def broken():
+            raise RuntimeError("warmup failed")
+        
+        main._on_ready_callbacks.append(broken)
+        task = asyncio.create_task(main._deferred_init())
+        task.add_done_callback(main._log_deferred_failure)
+        with caplog.at_level(logging.ERROR):
+            await asyncio.gather(task, return_exceptions=True)
+            await asyncio.sleep(0)
+        
+        assert not main._ready.is_set()
+        assert "Deferred startup failed" in caplog.text
+
+
+class TestRegisterRouters:
+    """Routers mount once however many times lifespan runs"""
+    
+    def test_second_call_is_a_no_op(self, monkeypatch):
+        # Routers not in this tree are stood in for by empty ones
+        for name in ("auth", "author", "admin", "analytics", "calibration"):
+            module = types.ModuleType(f"app.api.{name}")
+            module.router = APIRouter()
+            monkeypatch.setitem(sys.modules, f"app.api.{name}", module)
+            monkeypatch.setattr(app.api, name, module, raising=False)
+        monkeypatch.setattr(main, "_routers_registered", False)
+        monkeypatch.setattr(main, "_on_ready_callbacks", [])
+        target = FastAPI()
+        
+        main._register_routers(target)
+        routes = len(target.routes)
+        main._register_routers(target)
+        
+        assert any("/quizzes" in route.path for route in target.routes)
+        assert len(target.routes) == routes
+        assert main._on_ready_callbacks == [sys.modules["app.api.quizzes"].warmup]
@@ -0,0 +1,235 @@
+"""
+Quiz endpoint tests against an in-memory session and cache
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.api import quizzes
+from app.models.orm import QuizSession
+
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+    
+    def first(self):
+        return self.row
+    
+    def scalars(self):
+        return self
+
+
+class FakeDB:
+    """Returns queued rows in order and records the SQL it was sent"""
+    
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.statements = []
+    
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return FakeResult(self.rows.pop(0))
+    
+    async def commit(self):
+        pass
+
+
+class FakeCache:
+    def __init__(self):
+        self.store = {}
+    
+    async def get_correct(self, question_id, version):
+        return self.store.get(("ans", question_id, version))
+    
+    async def set_correct(self, question_id, version, data):
+        self.store[("ans", question_id, version)] = data
+    
+    async def get_session(self, quiz_id):
+        return None
+    
+    async def get_session_loglik(self, quiz_id):
+        return None
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fake = FakeCache()
+    monkeypatch.setattr(quizzes, "cache", fake)
+    return fake
+
+
+def _session():
+    return QuizSession(
+        id=uuid.uuid4(), user_id="u1", adaptive=False, config={},
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1)
+    )
+
+
+class AnswerRow:
+    topic_id = None
+    rationale_md = "because"
+    option_label = "B"
+    explanation_md = "B is right"
+
+
+class TestSubmitAnswer:
+    """Grading uses the version the quiz served"""
+    
+    @pytest.mark.asyncio
+    async def test_grades_served_version(self, cache):
+        session = _session()
+        db = FakeDB([(session, 3), AnswerRow(), None])
+        
+        out = await quizzes.submit_answer(str(session.id), 7, "B", 1000, None, db)
+        
+        assert out["correct"] is True
+        assert "question_versions.version = " in db.statements[1]
+        assert ("ans", 7, 3) in cache.store
+        assert "quiz_items.question_id = " in db.statements[0]
+    
+    @pytest.mark.asyncio
+    async def test_cached_key_is_per_version(self, cache):
+        session = _session()
+        cache.store[("ans", 7, 2)] = {
+            "topic_id": None, "label": "A", "explanation": "", "rationale": ""
+        }
+        db = FakeDB([(session, 3), AnswerRow(), None])
+        
+        out = await quizzes.submit_answer(str(session.id), 7, "A", 1000, None, db)
+        
+        assert out["correct"] is False
+        assert out["correct_answer"] == "B"
+    
+    @pytest.mark.asyncio
+    async def test_unserved_question_is_not_found(self, cache):
+        session = _session()
+        db = FakeDB([(session, None)])
+        
+        with pytest.raises(HTTPException) as exc:
+            await quizzes.submit_answer(str(session.id), 7, "A", 1000, None, db)
+        assert exc.value.status_code == 404
+
+
+class TestItemBank:
+    """Binned candidate lookup against a brute-force filter"""
+    
+    @pytest.fixture
+    def bank(self):
+        rng = np.random.default_rng(3)
+        n = 500
+        items = np.zeros(n, dtype=quizzes.ITEM_BANK_DTYPE)
+        items["question_id"] = np.arange(n)
+        items["topic_id"] = rng.choice([-1, 1, 2, 3], n)
+        items["difficulty"] = rng.integers(-1, 5, n)
+        return quizzes.ItemBank(items, {"t1": [1], "t2": [2], "t3": [3], "empty": [9]})
+    
+    def _expected(self, bank, topic_ids, codes):
+        items = bank.items
+        mask = np.ones(len(items), dtype=bool)
+        if topic_ids:
+            mask &= np.isin(items["topic_id"], topic_ids)
+        if codes is not None:
+            mask &= np.isin(items["difficulty"], codes)
+        return np.flatnonzero(mask).tolist()
+    
+    @pytest.mark.parametrize("topics,topic_ids", [
+        (None, []), (["t1"], [1]), (["t2", "t3"], [2, 3]),
+        (["missing"], []), (["t1", "missing"], [1]), (["empty"], [9]),
+    ])
+    @pytest.mark.parametrize("difficulty,codes", [
+        (None, None), (["easy"], [1]), (["medium", "hard"], [2, 3]),
+    ])
+    def test_matches_filter(self, bank, topics, topic_ids, difficulty, codes):
+        assert bank.candidates(topics, difficulty).tolist() == self._expected(
+            bank, topic_ids, codes
+        )
+    
+    def test_unknown_difficulty_matches_nothing(self, bank):
+        assert bank.candidates(None, ["impossible"]).tolist() == []
+        assert bank.candidates(["t1"], ["easy", "impossible"]).tolist() == self._expected(
+            bank, [1], [1]
+        )
+    
+    def test_round_trips_through_bytes(self, bank):
+        restored = quizzes.ItemBank.from_bytes(bank.to_bytes())
+        
+        assert (restored.items == bank.items).all()
+        assert restored.topic_ids == bank.topic_ids
+        assert restored.candidates(["t2"], ["hard"]).tolist() == bank.candidates(
+            ["t2"], ["hard"]
+        ).tolist()
+
+
+class TestAbilityUpsert:
+    """Adaptive answers upsert the ability row on the NULL-safe unique index"""
+    
+    @pytest.mark.asyncio
+    async def test_upserts_on_coalesced_topic(self, cache, monkeypatch):
+        session = _session()
+        session.adaptive = True
+        
+        async def get_session(quiz_id):
+            return {"theta": 0.0, "se": 1.0}
+        
+        async def get_session_loglik(quiz_id):
+            return np.zeros(quizzes.irt_engine.eap_loglik(1.0, 1.0, 0.0, 0.0).shape)
+        
+        async def noop(*args):
+            pass
+        
+        monkeypatch.setattr(cache, "get_session", get_session, raising=False)
+        monkeypatch.setattr(cache, "get_session_loglik", get_session_loglik, raising=False)
+        monkeypatch.setattr(cache, "set_session", noop, raising=False)
+        monkeypatch.setattr(cache, "set_session_loglik", noop, raising=False)
+        calibration = quizzes.ItemCalibration(a=1.2, b=0.3, c=0.1)
+        db = FakeDB([(session, 3), AnswerRow(), calibration, None])
+        
+        await quizzes.submit_answer(str(session.id), 7, "B", 1000, None, db)
+        
+        sql = db.statements[-1]
+        assert "INSERT INTO user_responses" in sql
+        assert "ON CONFLICT (user_id, coalesce(topic_id, -1)) DO UPDATE" in sql
+        assert "n_responses = (user_abilities.n_responses + " in sql
+    
+    def test_unique_index_treats_null_topic_as_value(self):
+        from sqlalchemy.schema import CreateIndex
+        from app.models.orm import UserAbility
+        
+        index, = [i for i in UserAbility.__table__.indexes if i.name == "uq_user_ability"]
+        ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        
+        assert ddl == (
+            "CREATE UNIQUE INDEX uq_user_ability ON user_abilities "
+            "(user_id, COALESCE(topic_id, -1))"
+        )
+
+
+class TestWarmup:
+    """Startup warmup compiles the kernels and loads the default bank"""
+    
+    @pytest.mark.asyncio
+    async def test_loads_default_item_bank(self, monkeypatch):
+        loaded = []
+        
+        class FakeSession:
+            async def __aenter__(self):
+                return "db"
+            
+            async def __aexit__(self, *exc):
+                pass
+        
+        async def load_item_bank(db, exam_code):
+            loaded.append((db, exam_code))
+        
+        monkeypatch.setattr(quizzes, "AsyncSessionLocal", FakeSession)
+        monkeypatch.setattr(quizzes, "load_item_bank", load_item_bank)
+        
+        await quizzes.warmup()
+        
+        assert loaded == [("db", None)]
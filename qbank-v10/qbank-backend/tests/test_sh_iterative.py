@@ -0,0 +1,92 @@
+"""
+Sympson-Hetter calibrator tests against the scalar kernel
+"""
+
+import numpy as np
+import pytest
+
+from analytics.calibration import sh_iterative
+from analytics.calibration.sh_iterative import (
+    ExposureControlParams, ItemPool, SympsonHetterCalibrator
+)
+
+
+def _pool(n_items=60, seed=0):
+    rng = np.random.default_rng(seed)
+    return ItemPool.from_items([
+        {
+            "question_id": i, "version": 1,
+            "a": float(rng.uniform(0.5, 2.0)),
+            "b": float(rng.normal()),
+            "c": float(rng.uniform(0.0, 0.3)),
+        }
+        for i in range(n_items)
+    ])
+
+
+def _calibrator(**overrides):
+    params = dict(n_simulees=200, test_length=10, iterations=3)
+    params.update(overrides)
+    return SympsonHetterCalibrator(ExposureControlParams(**params))
+
+
+@pytest.fixture
+def numpy_path(monkeypatch):
+    """Force the NumPy simulation path even when Numba is installed"""
+    monkeypatch.setattr(sh_iterative, "njit", None)
+
+
+class TestFisherInfo:
+    """Vectorized information matches the scalar kernel"""
+    
+    def test_matches_scalar(self):
+        pool = _pool()
+        calibrator = _calibrator()
+        calibrator._prepare_items(pool.a, pool.b, pool.c)
+        
+        for theta in (-3.0, -0.5, 0.0, 1.2, 3.0):
+            expected = [
+                sh_iterative._fisher_info_3pl_scalar(
+                    theta, calibrator._Da[i], calibrator._Dab[i], calibrator._c[i]
+                )
+                for i in range(len(pool))
+            ]
+            np.testing.assert_allclose(
+                calibrator._fisher_info_3pl_vec(theta), expected, rtol=1e-3, atol=1e-6
+            )
+
+
+class TestSimulation:
+    """NumPy selection agrees with the kernel where gates are deterministic"""
+    
+    def test_numpy_path_matches_kernel(self, numpy_path):
+        pool = _pool()
+        calibrator = _calibrator()
+        calibrator._prepare_items(pool.a, pool.b, pool.c)
+        # Gates of exactly 0 or 1 make every administration deterministic
+        shp = np.where(np.arange(len(pool)) % 3 == 0, 0.0, 1.0).astype(np.float32)
+        thetas = np.linspace(-2, 2, 25).astype(np.float32)
+        
+        numpy_counts = np.zeros(len(pool), dtype=np.int32)
+        calibrator._simulate_serial(thetas, shp, numpy_counts)
+        kernel_counts = np.zeros(len(pool), dtype=np.int32)
+        sh_iterative._simulate_kernel(
+            thetas, np.arange(len(thetas)), calibrator._Da, calibrator._Dab,
+            calibrator._c, shp, 10, kernel_counts
+        )
+        
+        assert (numpy_counts == kernel_counts).all()
+        assert numpy_counts[::3].sum() == 0
+    
+    def test_seeded_runs_ignore_worker_count(self, numpy_path):
+        serial = _calibrator(n_workers=1).calibrate(_pool(), seed=11)
+        parallel = _calibrator(n_workers=2).calibrate(_pool(), seed=11)
+        
+        assert serial == parallel
+    
+    def test_worker_pool_is_reused(self, numpy_path):
+        first = _calibrator(n_workers=2)._simulation_pool()
+        second = _calibrator(n_workers=2)._simulation_pool()
+        
+        with first as a, second as b:
+            assert a is b is sh_iterative._executors[2]
@@ -9,7 +9,7 @@ CREATE EXTENSION IF NOT EXISTS "pgcrypto";
 CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 CREATE EXTENSION IF NOT EXISTS "btree_gin";
 CREATE EXTENSION IF NOT EXISTS "ltree";
--- CREATE EXTENSION IF NOT EXISTS "vector";  -- Requires pgvector
+CREATE EXTENSION IF NOT EXISTS "vector";  -- Requires pgvector
 
 -- Create schemas
 CREATE SCHEMA IF NOT EXISTS qbank;
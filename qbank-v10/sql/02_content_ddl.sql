@@ -64,7 +64,7 @@ CREATE TABLE question_versions (
     assets JSONB DEFAULT '[]',
     references JSONB DEFAULT '[]',
     search_vector TSVECTOR,
-    -- embedding vector(768),  -- For semantic search (requires pgvector)
+    embedding vector(384),  -- For semantic search, all-MiniLM-L6-v2
     metadata JSONB DEFAULT '{}',
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW(),
@@ -83,7 +83,7 @@ CREATE INDEX idx_qv_state ON question_versions(state);
 CREATE INDEX idx_qv_version ON question_versions(version);
 CREATE INDEX idx_qv_tags ON question_versions USING GIN(tags);
 CREATE INDEX idx_qv_search ON question_versions USING GIN(search_vector);
--- CREATE INDEX idx_qv_embedding ON question_versions USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
+CREATE INDEX idx_qv_embedding ON question_versions USING hnsw (embedding vector_cosine_ops);
 CREATE INDEX idx_qv_metadata ON question_versions USING GIN(metadata);
 
 -- Trigger to update search vector